@@ -0,0 +1,124 @@
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import book_movie_spread
+import month_spread
+import year_spread
+from output_profile import PROFILES
+
+# --- SETTINGS ---
+DOCUMENTS = {
+    "year": year_spread,
+    "month": month_spread,
+    "books": book_movie_spread,
+}
+
+# Size budget in bytes per page for each document type, checked for every
+# profile except "default" (reportlab's own settings, kept as a baseline)
+SIZE_BUDGET = {
+    "year": 16_000,
+    "month": 40_000,
+    "books": 8_000,
+}
+
+# Startup budget in ms of wall time for a fresh interpreter, including the
+# interpreter's own startup. Worker processes pay this on every spawn.
+STARTUP_RUNS = 7
+STARTUP_BUDGET_MS = {
+    "import": 75,
+    "first_page": 300,
+}
+STARTUP_SNIPPETS = {
+    "import": "import year_spread",
+    "first_page": """
+import year_spread
+from drawing import register_fonts
+from geometry import get_layout
+from imposition import make_canvas
+register_fonts()
+c = make_canvas({filename!r}, get_layout().pagesize)
+year_spread.draw_year_page(c, year_spread.year)
+c.showPage()
+""",
+}
+
+
+def count_pages(filename):
+    try:
+        import pikepdf
+    except ImportError:
+        with open(filename, "rb") as f:
+            return len(re.findall(rb"/Type\s*/Page\b", f.read()))
+    with pikepdf.open(filename) as pdf:
+        return len(pdf.pages)
+
+
+def run_benchmarks(out_dir):
+    results = []
+    for doc, module in DOCUMENTS.items():
+        for profile in PROFILES:
+            filename = os.path.join(out_dir, f"{doc}_{profile}.pdf")
+            start = time.perf_counter()
+            module.create_pdf(filename, profile=profile)
+            elapsed = time.perf_counter() - start
+            size = os.path.getsize(filename)
+            pages = count_pages(filename)
+            results.append((doc, profile, elapsed, size, pages, size / pages))
+    return results
+
+
+def run_startup_benchmarks(out_dir):
+    """Median wall time in ms of each startup snippet in a new interpreter."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    filename = os.path.join(out_dir, "first_page.pdf")
+    results = {}
+    for name, snippet in STARTUP_SNIPPETS.items():
+        code = snippet.format(filename=filename)
+        timings = []
+        for _ in range(STARTUP_RUNS):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], cwd=here, check=True)
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = statistics.median(timings)
+    return results
+
+
+def main():
+    over_budget = False
+    with tempfile.TemporaryDirectory() as out_dir:
+        startup = run_startup_benchmarks(out_dir)
+        results = run_benchmarks(out_dir)
+
+    print(f"{'startup':<20}{'ms':>8}{'budget':>10}{'status':>8}")
+    for name, elapsed in startup.items():
+        budget = STARTUP_BUDGET_MS[name]
+        over_budget = over_budget or elapsed > budget
+        status = "ok" if elapsed <= budget else "OVER"
+        print(f"{name:<20}{elapsed:>8.1f}{budget:>10}{status:>8}")
+    print()
+
+    print(
+        f"{'document':<10}{'profile':<10}{'time s':>8}{'bytes':>10}"
+        f"{'pages':>7}{'bytes/page':>12}{'budget':>10}{'status':>8}"
+    )
+    for doc, profile, elapsed, size, pages, per_page in results:
+        # The default profile is the unchecked baseline
+        budget = status = ""
+        if profile != "default":
+            budget = SIZE_BUDGET[doc]
+            status = "ok" if per_page <= budget else "OVER"
+            over_budget = over_budget or per_page > budget
+        print(
+            f"{doc:<10}{profile:<10}{elapsed:>8.2f}{size:>10}"
+            f"{pages:>7}{per_page:>12.0f}{budget:>10}{status:>8}"
+        )
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
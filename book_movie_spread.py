@@ -1,91 +1,153 @@
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A5
-from reportlab.lib.units import mm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.pdfgen import canvas
+from functools import lru_cache
+from itertools import islice
+
+from drawing import (
+    LIGHT_FONT,
+    draw_dot_grid,
+    draw_text_in_cell,
+    draw_text_right_justified,
+    draw_text_vertically_centered,
+    draw_title_page,
+    render_pdf,
+    render_svg,
+)
+from geometry import get_layout
+from media_log import iter_log, log_sections
 
 # --- SETTINGS ---
-PAGE_WIDTH, PAGE_HEIGHT = A5
-DOT_SPACING = 5 * mm
-MARGIN_LEFT = 13 * mm
-MARGIN_RIGHT = 5 * mm
-TEXT_VERTICAL_ADJUST = 0.5 * mm
-DOT_RADIUS = 0.25 * mm
-LINE_WIDTH = DOT_RADIUS * 2
-
-# Fonts
-TEXT_FONT_FILE = "Merienda/static/Merienda-Medium.ttf"
-BOLD_FONT_FILE = "Merienda/static/Merienda-Black.ttf"
-TEXT_FONT = "Merienda_medium"
-BOLD_FONT = "Merienda_black"
-pdfmetrics.registerFont(TTFont(TEXT_FONT, TEXT_FONT_FILE))
-pdfmetrics.registerFont(TTFont(BOLD_FONT, BOLD_FONT_FILE))
-
-
-def draw_dot_grid(c, mirror_margins=False):
-    c.setFillGray(0.7)
-    left_margin = MARGIN_LEFT
-    right_margin = MARGIN_RIGHT
-    if mirror_margins:
-        left_margin, right_margin = MARGIN_RIGHT, MARGIN_LEFT
-    x = left_margin
-    while x <= PAGE_WIDTH - right_margin:
-        y = DOT_SPACING
-        while y <= PAGE_HEIGHT - DOT_SPACING:
-            c.circle(x, y, DOT_RADIUS, fill=1, stroke=0)
-            y += DOT_SPACING
-        x += DOT_SPACING
-    c.setFillGray(0)
-
-
-def draw_text_vertically_centered(c, text, x, y, font_name=TEXT_FONT, font_size=11):
-    c.setFont(font_name, font_size)
-    cy = y + (DOT_SPACING - font_size * 0.8) / 2
-    c.drawString(x, cy, text)
-
-
-def draw_text_right_justified(c, text, x, y, font_name=TEXT_FONT, font_size=11):
-    c.setFont(font_name, font_size)
-    text_width = c.stringWidth(text, font_name, font_size)
-    cx = x - text_width  # move left by text width to right-justify
-    cy = y + (DOT_SPACING - font_size * 0.8) / 2
-    c.drawString(cx, cy, text)
-
-
-def draw_title_page(c, title):
-    draw_dot_grid(c)
-    c.saveState()
-    c.translate(PAGE_WIDTH / 2, PAGE_HEIGHT / 2)
-    c.rotate(90)  # 90 degrees counterclockwise
-    font_size = 80
-    c.setFont(TEXT_FONT, font_size)
-    text_width = c.stringWidth(title, TEXT_FONT, font_size)
-    c.drawString(-text_width / 2, -font_size / 2, title)
-    c.restoreState()
-
-
-def draw_full_grid_page(c, mirror=False, text=""):
-    # Draw dotted background
-    draw_dot_grid(c, mirror_margins=not mirror)
+# Parts of the book, each a title page followed by its sections. A section
+# lists its pages as mirror flags, the heading goes on the first one.
+PARTS = [
+    (
+        "BOOKS",
+        [
+            ("FANTASY & SCI_FI", [False, True]),
+            ("MODERN PROSE & NON-FICTION", [False]),
+            ("FOREIGN LANGUAGES", [True]),
+        ],
+    ),
+    (
+        "MOVIES",
+        [
+            ("LIGHT FILMS", [False, True]),
+            ("SERIOUS FILMS", [False, True]),
+            ("LIGHT SERIES", [False, True]),
+            ("SERIOUS SERIES", [False, True]),
+            ("GAMES", [False, True]),
+        ],
+    ),
+]
+ENTRY_FONT_SIZE = 10
+
+
+@lru_cache(maxsize=None)
+def grid_page_table(layout, mirror, has_text):
+    """
+    Row and column positions of the ruled table on a grid page. Rows are
+    listed top to bottom; the lowest one is only closed by the vertical
+    lines, like the row below the shortened top line holding the heading.
+    """
+    dot_columns = layout.columns(not mirror)
+    num_rows = len(layout.dot_rows)
+    first_row = 6 if mirror else 0  # mirror pages keep the legend below
+    last_row = num_rows - 3 if has_text else num_rows - 2
+    return {
+        "rows": layout.dot_rows[first_row : last_row + 1][::-1],
+        "title_x": dot_columns[1],
+        "title_width": dot_columns[-3] - dot_columns[1],
+        "status_x": dot_columns[-3],
+        "rating_x": dot_columns[-2],
+    }
+
+
+@lru_cache(maxsize=None)
+def char_width(char, font_name, font_size):
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    return stringWidth(char, font_name, font_size)
+
+
+def fit_text(c, text, font_name, font_size, width):
+    """Shorten text with an ellipsis until it fits into width."""
+    if c.stringWidth(text, font_name, font_size) <= width:
+        return text
+    # Cut where the running sum of character widths leaves no room for the
+    # ellipsis; re-measuring every shorter prefix is quadratic in the length
+    room = width - c.stringWidth("…", font_name, font_size)
+    used = 0
+    for cut, char in enumerate(text):
+        used += char_width(char, font_name, font_size)
+        if used > room:
+            break
+    else:
+        cut = len(text)
+    return text[:cut].rstrip() + "…"
+
+
+def draw_entries(c, entries, mirror=False, text="", layout=None):
+    """Write log entries into the rows of a grid page, from the top."""
+    layout = layout or get_layout()
+    table = grid_page_table(layout, mirror, bool(text))
+    font_size = ENTRY_FONT_SIZE * layout.font_scale
+    # A quarter dot of padding on both sides of the title
+    title_x = table["title_x"] + layout.dot_spacing / 4
+    title_width = table["title_width"] - layout.dot_spacing / 2
+    for entry, y in zip(entries, table["rows"]):
+        title = fit_text(c, entry.title, LIGHT_FONT, font_size, title_width)
+        draw_text_vertically_centered(
+            c, title, title_x, y, LIGHT_FONT, ENTRY_FONT_SIZE, layout=layout
+        )
+        if entry.status:
+            draw_text_in_cell(
+                c, entry.status, table["status_x"], y, LIGHT_FONT, 9, layout=layout
+            )
+        if entry.rating:
+            draw_text_in_cell(
+                c, entry.rating, table["rating_x"], y, LIGHT_FONT, 9, layout=layout
+            )
+
 
-    # Calculate margins
-    left_margin = MARGIN_RIGHT if not mirror else MARGIN_LEFT
-    right_margin = MARGIN_LEFT if not mirror else MARGIN_RIGHT
-    x_start = left_margin
-    x_end = PAGE_WIDTH - right_margin
-    y_start = DOT_SPACING
-    y_end = PAGE_HEIGHT - DOT_SPACING
+def section_pages(heading, mirrors, entries, layout):
+    """
+    Yield (mirror, text, entries) for the pages of a section. Entries that do
+    not fit on the section's own pages continue on extra pages, added in
+    whole spreads so the rest of the book keeps its page sides.
+    """
+    entries = iter(entries)
 
-    # Compute dot columns and rows
-    num_cols = int((x_end - x_start) / DOT_SPACING) + 1
-    dot_columns = [x_start + i * DOT_SPACING for i in range(num_cols)]
+    def take(mirror, text):
+        rows = grid_page_table(layout, mirror, bool(text))["rows"]
+        return list(islice(entries, len(rows)))
 
-    num_rows = int((y_end - y_start) / DOT_SPACING) + 1
-    dot_rows = [y_start + i * DOT_SPACING for i in range(num_rows)]
+    for i, mirror in enumerate(mirrors):
+        text = heading if i == 0 else ""
+        yield mirror, text, take(mirror, text)
 
-    # Determine bottom limit for mirrored pages
-    bottom_limit = 40 * mm if mirror else dot_rows[1]
+    mirror = not mirrors[-1]
+    extra_pages = 0
+    while chunk := take(mirror, ""):
+        yield mirror, "", chunk
+        mirror = not mirror
+        extra_pages += 1
+    if extra_pages % 2:
+        yield mirror, "", []
+
+
+def draw_full_grid_page(c, mirror=False, text="", layout=None, entries=()):
+    layout = layout or get_layout()
+    dot_spacing = layout.dot_spacing
+
+    # Draw dotted background
+    draw_dot_grid(c, mirror_margins=not mirror, layout=layout)
+
+    # Dot columns and rows of the grid drawn above
+    dot_columns = layout.columns(not mirror)
+    num_cols = len(dot_columns)
+    dot_rows = layout.dot_rows
+    num_rows = len(dot_rows)
+
+    # Determine bottom limit for mirrored pages (40 mm on A5)
+    bottom_limit = dot_rows[7] if mirror else dot_rows[1]
 
     # --- Horizontal lines ---
     for i, y in enumerate(dot_rows):
@@ -103,7 +165,7 @@ def draw_full_grid_page(c, mirror=False, text=""):
             c.line(dot_columns[0], y, dot_columns[-1], y)
 
     # --- Vertical lines ---
-    bottom_limit = bottom_limit - 5 * mm
+    bottom_limit = bottom_limit - dot_spacing
     vertical_indices = [1, num_cols - 3, num_cols - 2]
     vertical_columns = [dot_columns[i] for i in vertical_indices]
 
@@ -117,76 +179,97 @@ def draw_full_grid_page(c, mirror=False, text=""):
     if text:
         text_y = dot_rows[-2]
         text_x = vertical_columns[0]
-        draw_text_vertically_centered(c, text, text_x, text_y)
+        draw_text_vertically_centered(c, text, text_x, text_y, layout=layout)
 
     # --- Add ratings text ---
     if mirror:
         smaller_font_size = 10
         ratings = ["Great", "Good", "OK", "Meh", "Didn't finish"][::-1]
         start_y = dot_rows[0]
-        x_pos = dot_columns[-1] - 30 * mm
+        x_pos = dot_columns[-1] - 6 * dot_spacing  # (30 mm)
         for i, rating in enumerate(ratings):
-            y_pos = start_y + i * DOT_SPACING
+            y_pos = start_y + i * dot_spacing
             draw_text_vertically_centered(
-                c, rating, x_pos, y_pos, font_size=smaller_font_size
+                c, rating, x_pos, y_pos, font_size=smaller_font_size, layout=layout
             )
 
         # --- Add right-justified tracking text ---
         tracking_lines = ["New", "Repeat", "Previously unfinished"][::-1]
         start_row_index = 1  # 2nd row from bottom
-        x_pos = dot_columns[-1] - 45 * mm  # 45 mm from rightmost dot column
+        x_pos = dot_columns[-1] - 9 * dot_spacing  # (45 mm)
         for i, line in enumerate(tracking_lines):
             y_pos = dot_rows[start_row_index + i]
             draw_text_right_justified(
-                c, line, x_pos, y_pos, font_size=smaller_font_size
+                c, line, x_pos, y_pos, font_size=smaller_font_size, layout=layout
             )
 
+    # --- Add log entries ---
+    if entries:
+        draw_entries(c, entries, mirror, text, layout=layout)
+
+
+def check_log_sections(log_csv):
+    known = {heading for _, sections in PARTS for heading, _ in sections}
+    unknown = log_sections(log_csv) - known
+    if unknown:
+        raise ValueError(f"Unknown sections in {log_csv}: {sorted(unknown)}")
+
+
+def draw_pages(c, log_csv=None, layout=None):
+    """
+    Draw all pages of the books/movies part, shared by the PDF and SVG
+    output. log_csv fills the tables from an export, see media_log.py. It is
+    read once per section so that only one page of entries is held at a time.
+    """
+    layout = layout or get_layout()
+    if log_csv:
+        check_log_sections(log_csv)
+    for title, sections in PARTS:
+        draw_title_page(c, title, layout=layout)
+        c.showPage()
+        for heading, mirrors in sections:
+            entries = iter_log(log_csv, heading) if log_csv else ()
+            for mirror, text, chunk in section_pages(heading, mirrors, entries, layout):
+                draw_full_grid_page(c, mirror, text, layout=layout, entries=chunk)
+                c.showPage()
+        draw_dot_grid(c, layout=layout)
+        c.showPage()
+
+
+def create_pdf(
+    filename=None,
+    sheet=None,
+    creep=0,
+    profile="default",
+    paper="A5",
+    pitch_mm=5,
+    log_csv=None,
+    deterministic=False,
+):
+    """
+    Build the books/movies part, with the tables filled from log_csv if
+    given. The other options are those of render_pdf.
+    """
+    layout = get_layout(paper, pitch_mm)
+    if filename is None:
+        filename = "bullet_journal_books.pdf"
+    render_pdf(
+        draw_pages,
+        filename,
+        layout,
+        sheet=sheet,
+        creep=creep,
+        profile=profile,
+        deterministic=deterministic,
+        log_csv=log_csv,
+    )
+
 
-def create_pdf(filename=None):
+def create_svg(filename=None, paper="A5", pitch_mm=5, log_csv=None):
+    layout = get_layout(paper, pitch_mm)
     if filename is None:
-        filename = f"bullet_journal_books.pdf"
-    c = canvas.Canvas(filename, pagesize=A5)
-
-    draw_title_page(c, "BOOKS")
-    c.showPage()
-
-    draw_full_grid_page(c, False, "FANTASY & SCI_FI")
-    c.showPage()
-    draw_full_grid_page(c, True, "")
-    c.showPage()
-    draw_full_grid_page(c, False, "MODERN PROSE & NON-FICTION")
-    c.showPage()
-    draw_full_grid_page(c, True, "FOREIGN LANGUAGES")
-    c.showPage()
-    draw_dot_grid(c)
-    c.showPage()
-
-    draw_title_page(c, "MOVIES")
-    c.showPage()
-    draw_full_grid_page(c, False, "LIGHT FILMS")
-    c.showPage()
-    draw_full_grid_page(c, True, "")
-    c.showPage()
-    draw_full_grid_page(c, False, "SERIOUS FILMS")
-    c.showPage()
-    draw_full_grid_page(c, True, "")
-    c.showPage()
-    draw_full_grid_page(c, False, "LIGHT SERIES")
-    c.showPage()
-    draw_full_grid_page(c, True, "")
-    c.showPage()
-    draw_full_grid_page(c, False, "SERIOUS SERIES")
-    c.showPage()
-    draw_full_grid_page(c, True, "")
-    c.showPage()
-    draw_full_grid_page(c, False, "GAMES")
-    c.showPage()
-    draw_full_grid_page(c, True, "")
-    c.showPage()
-    draw_dot_grid(c)
-    c.showPage()
-
-    c.save()
+        filename = "bullet_journal_books.svg"
+    return render_svg(draw_pages, filename, layout, log_csv=log_csv)
 
 
 if __name__ == "__main__":
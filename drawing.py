@@ -0,0 +1,237 @@
+import calendar
+from datetime import date
+from functools import lru_cache
+
+from geometry import get_layout
+from output_profile import canvas_options, finalize_pdf
+from overlay import mark_day
+
+# Fonts
+TEXT_FONT_FILE = "Merienda/static/Merienda-Medium.ttf"
+BOLD_FONT_FILE = "Merienda/static/Merienda-Black.ttf"
+LIGHT_FONT_FILE = "Merienda/static/Merienda-Light.ttf"
+TEXT_FONT = "Merienda_medium"
+BOLD_FONT = "Merienda_black"
+LIGHT_FONT = "Merienda_light"
+
+# Font sizes below are given for A5 with a 5 mm pitch and scaled by the
+# layout (see geometry.Layout). Colours are reportlab colour names so that
+# importing this module does not load reportlab.
+
+
+@lru_cache(maxsize=None)
+def register_fonts():
+    """Register the Merienda fonts with reportlab, once per process."""
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    pdfmetrics.registerFont(TTFont(TEXT_FONT, TEXT_FONT_FILE))
+    pdfmetrics.registerFont(TTFont(BOLD_FONT, BOLD_FONT_FILE))
+    pdfmetrics.registerFont(TTFont(LIGHT_FONT, LIGHT_FONT_FILE))
+
+
+def render_pdf(
+    draw_pages,
+    filename,
+    layout,
+    sheet=None,
+    creep=0,
+    profile="default",
+    deterministic=False,
+    **draw_options,
+):
+    """
+    Build a PDF with ``draw_pages(c, layout=layout, **draw_options)``, the
+    shared body of the create_pdf entry points. sheet="A4"/"A3" imposes the
+    pages as a saddle-stitch booklet (see imposition.py), profile and
+    deterministic are described in output_profile.py.
+    """
+    # reportlab's canvas stack is only loaded once a PDF is actually built
+    from imposition import make_canvas
+
+    register_fonts()
+    c = make_canvas(
+        filename,
+        layout.pagesize,
+        sheet=sheet,
+        creep=creep,
+        **canvas_options(profile, deterministic),
+    )
+    draw_pages(c, layout=layout, **draw_options)
+    c.save()
+    finalize_pdf(filename, profile, deterministic)
+
+
+def render_svg(draw_pages, filename, layout, **draw_options):
+    """
+    SVG counterpart of render_pdf, see svg_canvas.py. Writes all pages into
+    filename unless it is False and returns the canvas for page_svg().
+    """
+    from svg_canvas import SVGCanvas
+
+    register_fonts()
+    c = SVGCanvas(filename, layout.pagesize)
+    draw_pages(c, layout=layout, **draw_options)
+    c.save()
+    return c
+
+
+def dot_grid_form_name(layout, mirror_margins=False):
+    side = "mirrored" if mirror_margins else "plain"
+    return f"dots_{layout.paper}_{layout.pitch_mm}mm_{side}"
+
+
+def draw_dot_grid(c, mirror_margins=False, layout=None):
+    """
+    Place the dot grid of a page. The ~1,000 dots are drawn once per
+    document into a form and every page refers to it.
+    """
+    layout = layout or get_layout()
+    name = dot_grid_form_name(layout, mirror_margins)
+    if not c.hasForm(name):
+        c.beginForm(name, 0, 0, layout.page_width, layout.page_height)
+        c.setFillGray(0.7)
+        columns = layout.columns(mirror_margins)
+        if hasattr(c, "drawDotGrid"):
+            # Backends that can tile (SVG) repeat a single dot
+            c.drawDotGrid(columns, layout.dot_rows, layout.dot_radius)
+        else:
+            for x in columns:
+                for y in layout.dot_rows:
+                    c.circle(x, y, layout.dot_radius, fill=1, stroke=0)
+        c.endForm()
+    c.doForm(name)
+
+
+def draw_text_in_cell(
+    c, text, x, y, font_name=TEXT_FONT, font_size=9, color="black", layout=None
+):
+    layout = layout or get_layout()
+    font_size *= layout.font_scale
+    c.setFont(font_name, font_size)
+    c.setFillColor(color)
+    text_width = c.stringWidth(text, font_name, font_size)
+    ascent = c._fontsize * 0.8
+    descent = c._fontsize * 0.2
+    text_height = ascent + descent
+    cx = x + (layout.dot_spacing - text_width) / 2
+    cy = (
+        y
+        + (layout.dot_spacing - text_height) / 2
+        + descent
+        - layout.text_vertical_adjust
+    )
+    c.drawString(cx, cy, text)
+    c.setFillColor("black")
+
+
+def mini_calendar_form_name(
+    year, month, font_name, font_size, layout, first_weekday, marked
+):
+    name = (
+        f"cal_{year}_{month:02d}_{first_weekday}_{font_name}_{font_size:g}"
+        f"_{layout.paper}_{layout.pitch_mm}mm"
+    )
+    # A canvas is only ever drawn with one overlay, so one marked variant
+    return name + "_marked" if marked else name
+
+
+def draw_mini_calendar(
+    c,
+    year,
+    month,
+    x,
+    y,
+    overlay=None,
+    font_name=TEXT_FONT,
+    font_size=9,
+    layout=None,
+    first_weekday=calendar.MONDAY,
+):
+    """
+    Place the day matrix of a month with its first week in the cell row at
+    y, starting at x. Each month is drawn once per document into a form,
+    with the overlay marks if any, and every page showing it refers to that
+    form. Returns the y of the row below the last week.
+    """
+    layout = layout or get_layout()
+    dot_spacing = layout.dot_spacing
+    weeks = calendar.Calendar(first_weekday).monthdayscalendar(year, month)
+    name = mini_calendar_form_name(
+        year, month, font_name, font_size, layout, first_weekday, overlay is not None
+    )
+    if not c.hasForm(name):
+        # Form space has the first week's cell row at y=0
+        c.beginForm(
+            name, 0, -len(weeks) * dot_spacing, 7 * dot_spacing, 2 * dot_spacing
+        )
+        for row, week in enumerate(weeks):
+            cell_y = -row * dot_spacing
+            for column, day in enumerate(week):
+                if day == 0:
+                    continue
+                cell_x = column * dot_spacing
+                color = mark_day(
+                    c, overlay, date(year, month, day), cell_x, cell_y, dot_spacing
+                )
+                draw_text_in_cell(
+                    c,
+                    str(day),
+                    cell_x,
+                    cell_y,
+                    font_name,
+                    font_size,
+                    color=color or "black",
+                    layout=layout,
+                )
+        c.endForm()
+    c.saveState()
+    c.translate(x, y)
+    c.doForm(name)
+    c.restoreState()
+    return y - len(weeks) * dot_spacing
+
+
+def draw_text_vertically_centered(
+    c, text, x, y, font_name=TEXT_FONT, font_size=11, layout=None
+):
+    layout = layout or get_layout()
+    font_size *= layout.font_scale
+    c.setFont(font_name, font_size)
+    cy = y + (layout.dot_spacing - font_size * 0.8) / 2
+    c.drawString(x, cy, text)
+
+
+def draw_text_right_justified(
+    c, text, x, y, font_name=TEXT_FONT, font_size=11, layout=None
+):
+    layout = layout or get_layout()
+    font_size *= layout.font_scale
+    c.setFont(font_name, font_size)
+    text_width = c.stringWidth(text, font_name, font_size)
+    cx = x - text_width  # move left by text width to right-justify
+    cy = y + (layout.dot_spacing - font_size * 0.8) / 2
+    c.drawString(cx, cy, text)
+
+
+def draw_text_across_grid(
+    c, text, start_x, base_y, font_name=BOLD_FONT, font_size=11, layout=None
+):
+    layout = layout or get_layout()
+    x = start_x
+    for letter in text:
+        draw_text_in_cell(c, letter, x, base_y, font_name, font_size, layout=layout)
+        x += layout.dot_spacing
+
+
+def draw_title_page(c, title, layout=None):
+    layout = layout or get_layout()
+    draw_dot_grid(c, layout=layout)
+    c.saveState()
+    c.translate(layout.page_width / 2, layout.page_height / 2)
+    c.rotate(90)  # 90 degrees counterclockwise
+    font_size = 80 * layout.page_scale
+    c.setFont(TEXT_FONT, font_size)
+    text_width = c.stringWidth(title, TEXT_FONT, font_size)
+    c.drawString(-text_width / 2, -font_size / 2, title)
+    c.restoreState()
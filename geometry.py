@@ -0,0 +1,111 @@
+from collections import namedtuple
+from functools import lru_cache
+
+from reportlab.lib.pagesizes import A4, A5, A6, B5, B6
+from reportlab.lib.units import mm
+
+# --- SETTINGS ---
+PAPER_SIZES = {"A6": A6, "B6": B6, "A5": A5, "B5": B5, "A4": A4}
+DOT_PITCHES_MM = (5, 4)
+
+# Reference configuration the page designs were drawn for
+REFERENCE_PAPER = "A5"
+REFERENCE_PITCH_MM = 5
+
+MARGIN_LEFT = 13 * mm
+MARGIN_RIGHT = 5 * mm
+TEXT_VERTICAL_ADJUST = 0.5 * mm
+DOT_RADIUS = 0.25 * mm
+
+
+# Dot positions are tuples; columns for the normal and the mirrored margins
+LAYOUT_FIELDS = [
+    "paper",
+    "pitch_mm",
+    "page_width",
+    "page_height",
+    "dot_spacing",
+    "margin_left",
+    "margin_right",
+    "text_vertical_adjust",
+    "dot_radius",
+    "line_width",
+    "grey_line_width",
+    "font_scale",
+    "page_scale",
+    "dot_columns",
+    "dot_columns_mirrored",
+    "dot_rows",
+]
+
+
+# A namedtuple rather than a dataclass: immutable, hashable for the
+# lru_cache'd page tables, and cheap to import
+class Layout(namedtuple("Layout", LAYOUT_FIELDS)):
+    """
+    Page geometry for one paper size and dot pitch.
+
+    ``font_scale`` scales text that sits in dot cells with the pitch and
+    ``page_scale`` scales display text (titles, year) with the paper size,
+    both relative to A5 with a 5 mm pitch.
+    """
+
+    __slots__ = ()
+
+    @property
+    def pagesize(self):
+        return (self.page_width, self.page_height)
+
+    def columns(self, mirror_margins=False):
+        return self.dot_columns_mirrored if mirror_margins else self.dot_columns
+
+
+def dot_positions(start, end, spacing):
+    # Accumulate like the original drawing loops so positions match exactly
+    positions = []
+    x = start
+    while x <= end:
+        positions.append(x)
+        x += spacing
+    return tuple(positions)
+
+
+@lru_cache(maxsize=None)
+def get_layout(paper=REFERENCE_PAPER, pitch_mm=REFERENCE_PITCH_MM):
+    """Return the cached layout table for a paper size and dot pitch in mm."""
+    if paper not in PAPER_SIZES:
+        raise ValueError(
+            f"Unknown paper size {paper!r}, expected one of {list(PAPER_SIZES)}"
+        )
+    if pitch_mm not in DOT_PITCHES_MM:
+        raise ValueError(
+            f"Unsupported dot pitch {pitch_mm!r} mm, expected one of {DOT_PITCHES_MM}"
+        )
+
+    page_width, page_height = PAPER_SIZES[paper]
+    ref_width, ref_height = PAPER_SIZES[REFERENCE_PAPER]
+    dot_spacing = pitch_mm * mm
+    font_scale = pitch_mm / REFERENCE_PITCH_MM
+
+    return Layout(
+        paper=paper,
+        pitch_mm=pitch_mm,
+        page_width=page_width,
+        page_height=page_height,
+        dot_spacing=dot_spacing,
+        margin_left=MARGIN_LEFT,
+        margin_right=MARGIN_RIGHT,
+        text_vertical_adjust=TEXT_VERTICAL_ADJUST * font_scale,
+        dot_radius=DOT_RADIUS,
+        line_width=DOT_RADIUS * 2,
+        grey_line_width=DOT_RADIUS * 1.2,
+        font_scale=font_scale,
+        page_scale=min(page_width / ref_width, page_height / ref_height),
+        dot_columns=dot_positions(
+            MARGIN_LEFT, page_width - MARGIN_RIGHT, dot_spacing
+        ),
+        dot_columns_mirrored=dot_positions(
+            MARGIN_RIGHT, page_width - MARGIN_LEFT, dot_spacing
+        ),
+        dot_rows=dot_positions(dot_spacing, page_height - dot_spacing, dot_spacing),
+    )
@@ -0,0 +1,137 @@
+from reportlab.lib.pagesizes import A3, A4, A5, landscape, portrait
+from reportlab.pdfgen import canvas
+
+# --- SETTINGS ---
+SHEET_SIZES = {"A4": A4, "A3": A3}
+FORM_PREFIX = "page"
+
+
+def booklet_order(page_count):
+    """
+    Return the saddle-stitch page order as a list of sheets.
+
+    Each sheet is ((front_left, front_right), (back_left, back_right)) with
+    0-based page indices; ``None`` marks a blank page added to pad the book
+    to a multiple of 4. Sheet 0 is the outermost sheet of the fold.
+    """
+    padded = (page_count + 3) // 4 * 4
+    last = padded - 1
+
+    def page(i):
+        return i if i < page_count else None
+
+    sheets = []
+    for k in range(padded // 4):
+        front = (page(last - 2 * k), page(2 * k))
+        back = (page(2 * k + 1), page(last - 2 * k - 1))
+        sheets.append((front, back))
+    return sheets
+
+
+def sheet_layout(sheet_size, page_size):
+    """
+    Pick the sheet orientation that fits the most page spreads and return
+    (sheet_size, spread origins) with origins listed top to bottom.
+    """
+    page_width, page_height = page_size
+    spread_width = 2 * page_width
+    best = None
+    for size in (landscape(sheet_size), portrait(sheet_size)):
+        width, height = size
+        # Small tolerance: A5 is exactly half of A4 but not in floating point
+        rows = int(height / page_height + 1e-6)
+        if width + 1e-6 < spread_width or rows == 0:
+            continue
+        if best is None or rows > len(best[1]):
+            x = (width - spread_width) / 2
+            y_gap = (height - rows * page_height) / (rows + 1)
+            origins = [
+                (x, height - (row + 1) * (y_gap + page_height))
+                for row in range(rows)
+            ]
+            best = (size, origins)
+    if best is None:
+        raise ValueError("Page spread does not fit on the sheet")
+    return best
+
+
+class BookletCanvas(canvas.Canvas):
+    """
+    Canvas that records every page as a form XObject and, on save, imposes
+    the forms on larger sheets in saddle-stitch order.
+
+    The page content is stored once per page and only referenced from the
+    sheets; the form and sheet objects add a few percent over the plain
+    document (0.5-3% for the journals on A4 and A3). With more than one
+    spread per sheet side (A5 on A3), sheets are meant to be cut and the
+    lower stack nested inside the upper one.
+
+    ``creep`` is the shift towards the spine added per sheet from the
+    outside in, compensating for inner sheets pushing out at the fore-edge.
+    """
+
+    def __init__(self, filename, pagesize=A5, sheet="A4", creep=0, **kwargs):
+        self._booklet_page_size = pagesize
+        sheet_size, self._spread_origins = sheet_layout(SHEET_SIZES[sheet], pagesize)
+        self._creep = creep
+        self._page_forms = []
+        canvas.Canvas.__init__(self, filename, pagesize=sheet_size, **kwargs)
+        self._begin_page_form()
+
+    def _begin_page_form(self):
+        name = f"{FORM_PREFIX}{len(self._page_forms)}"
+        width, height = self._booklet_page_size
+        self.beginForm(name, 0, 0, width, height)
+
+    def showPage(self):
+        self._page_forms.append(self._formData[0])
+        self.endForm()
+        self._begin_page_form()
+
+    def _discard_page_form(self):
+        # The form opened after the last showPage is empty; drop it unwritten
+        self._restartAccumulators()
+        self.pop_state_stack()
+        self._doc.inObject = None
+
+    def _draw_page(self, index, x, y):
+        if index is None:
+            return
+        self.saveState()
+        self.translate(x, y)
+        self.doForm(self._page_forms[index])
+        self.restoreState()
+
+    def _impose(self):
+        page_width = self._booklet_page_size[0]
+        sheets = booklet_order(len(self._page_forms))
+        slots = len(self._spread_origins)
+        stack = (len(sheets) + slots - 1) // slots
+
+        # Front then back of each physical sheet, ready for duplex printing
+        for sheet_index in range(stack):
+            for side in (0, 1):
+                for slot, (x, y) in enumerate(self._spread_origins):
+                    k = sheet_index + slot * stack
+                    if k >= len(sheets):
+                        continue
+                    left, right = sheets[k][side]
+                    shift = self._creep * k
+                    self._draw_page(left, x + shift, y)
+                    self._draw_page(right, x + page_width - shift, y)
+                canvas.Canvas.showPage(self)
+
+    def save(self):
+        if self._code:
+            self.showPage()
+        self._discard_page_form()
+        self._impose()
+        self._doc.SaveToFile(self._filename, self)
+
+
+def make_canvas(filename, pagesize=A5, sheet=None, creep=0, **kwargs):
+    if sheet is None:
+        return canvas.Canvas(filename, pagesize=pagesize, **kwargs)
+    return BookletCanvas(
+        filename, pagesize=pagesize, sheet=sheet, creep=creep, **kwargs
+    )
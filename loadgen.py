@@ -0,0 +1,113 @@
+"""
+Load generator for service.py.
+
+Sends a mix of build jobs to a running service with a fixed number of
+concurrent connections and prints client-side latencies next to the
+service's own metrics, to size the worker pool and queue.
+
+    python service.py --workers 4 &
+    python loadgen.py --jobs 200 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import time
+
+from service import HOST, PORT, percentile
+
+# --- SETTINGS ---
+# Job mix cycled through by the generator
+JOB_MIX = [
+    {"type": "month", "year": 2026, "month": 1},
+    {"type": "month", "year": 2026, "month": 2, "overrides": {"paper": "B6"}},
+    {"type": "year", "year": 2026},
+    {"type": "month", "year": 2026, "month": 3, "overrides": {"pitch_mm": 4}},
+    {"type": "books"},
+]
+
+
+async def request(reader, writer, message):
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def client(host, port, jobs, results, retry_delay):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for job in jobs:
+            start = time.perf_counter()
+            while True:
+                response = await request(reader, writer, job)
+                if response["status"] != "rejected" or retry_delay is None:
+                    break
+                # Back off while the service applies backpressure
+                await asyncio.sleep(retry_delay)
+            response["client_ms"] = (time.perf_counter() - start) * 1000
+            results.append(response)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run_load(host, port, total_jobs, concurrency, retry_delay):
+    mix = itertools.cycle(JOB_MIX)
+    jobs = [next(mix) for _ in range(total_jobs)]
+    # Spread the jobs round-robin over the connections
+    per_client = [jobs[i::concurrency] for i in range(concurrency)]
+    results = []
+    start = time.perf_counter()
+    clients = [
+        client(host, port, chunk, results, retry_delay)
+        for chunk in per_client
+        if chunk
+    ]
+    await asyncio.gather(*clients)
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    metrics = await request(reader, writer, {"cmd": "metrics"})
+    writer.close()
+    await writer.wait_closed()
+    return results, elapsed, metrics
+
+
+def report(results, elapsed, metrics):
+    statuses = {}
+    for result in results:
+        statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+    ok = sorted(r["client_ms"] for r in results if r["status"] == "ok")
+    print(f"jobs: {len(results)} in {elapsed:.1f} s, {statuses}")
+    print(f"throughput: {len(ok) / elapsed:.2f} jobs/s")
+    for q in (50, 90, 95, 99):
+        value = percentile(ok, q)
+        print(f"client p{q}: " + (f"{value:.0f} ms" if value is not None else "-"))
+    print("service metrics:")
+    print(json.dumps(metrics, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--retry-delay",
+        type=float,
+        default=0.2,
+        help="seconds to wait before resubmitting a rejected job; -1 to not retry",
+    )
+    args = parser.parse_args()
+    retry_delay = None if args.retry_delay < 0 else args.retry_delay
+    report(
+        *asyncio.run(
+            run_load(args.host, args.port, args.jobs, args.concurrency, retry_delay)
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+from collections import namedtuple
+
+# Reading a log is plain streaming: rows are parsed one at a time and never
+# collected, so a 10k+ row export costs the same memory as a 10 row one.
+
+# --- SETTINGS ---
+# Marks written into the two narrow columns on the right of a log row.
+# Tracking uses the first letter of the legend on the mirror pages, ratings
+# count up the legend from "Didn't finish" (1) to "Great" (5).
+STATUS_MARKS = {
+    "new": "N",
+    "repeat": "R",
+    "previously unfinished": "P",
+}
+RATING_MARKS = {
+    "didn't finish": "1",
+    "meh": "2",
+    "ok": "3",
+    "good": "4",
+    "great": "5",
+}
+
+LogEntry = namedtuple("LogEntry", ["section", "title", "status", "rating"])
+
+
+def normalize_mark(value, marks):
+    """Map a legend word, a mark or a rating number onto its printed mark."""
+    value = (value or "").strip()
+    if not value:
+        return ""
+    mark = marks.get(value.lower())
+    if mark is not None:
+        return mark
+    if value.upper() in marks.values():
+        return value.upper()
+    raise ValueError(f"Unknown log value {value!r}, expected one of {list(marks)}")
+
+
+def iter_log(path, section=None):
+    """
+    Stream entries from a CSV export with a header row. Columns: ``section``
+    (a heading of the books/movies pages), ``title`` and optional ``status``
+    and ``rating`` (legend words or their marks). With ``section`` set only
+    the rows of that section are yielded, in file order.
+    """
+    import csv
+
+    wanted = section.upper() if section else None
+    with open(path, newline="", encoding="utf-8") as f:
+        for line_number, row in enumerate(csv.DictReader(f), start=2):
+            row_section = (row.get("section") or "").strip().upper()
+            if wanted is not None and row_section != wanted:
+                continue
+            try:
+                yield LogEntry(
+                    row_section,
+                    (row.get("title") or "").strip(),
+                    normalize_mark(row.get("status"), STATUS_MARKS),
+                    normalize_mark(row.get("rating"), RATING_MARKS),
+                )
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_number}: {e}") from None
+
+
+def log_sections(path):
+    """Return the set of sections used in a log, in one streaming pass."""
+    return {entry.section for entry in iter_log(path)}
@@ -1,138 +1,124 @@
 import calendar
-
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A5
-from reportlab.lib.units import mm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.pdfgen import canvas
+from datetime import date
+from functools import lru_cache
+
+from drawing import (
+    BOLD_FONT,
+    LIGHT_FONT,
+    TEXT_FONT,
+    draw_dot_grid,
+    draw_mini_calendar,
+    draw_text_across_grid,
+    draw_text_in_cell,
+    draw_text_vertically_centered,
+    draw_title_page,
+    render_pdf,
+    render_svg,
+)
+from geometry import get_layout
+from overlay import build_index, draw_legend_swatch, mark_day
 
 # --- SETTINGS ---
-PAGE_WIDTH, PAGE_HEIGHT = A5
-DOT_SPACING = 5 * mm
-MARGIN_LEFT = 13 * mm  # 1.3 cm
-MARGIN_RIGHT = 5 * mm  # 0.5 cm
-TEXT_VERTICAL_ADJUST = 0.5 * mm  # fine-tune vertical position of text
-
-LINE_Y = PAGE_HEIGHT - (2 * DOT_SPACING)  # 2nd dot row from top
-LINE_X_START = MARGIN_LEFT
-LINE_X_SPLIT = LINE_X_START + 85 * mm  # 8.5 cm first line length
-LINE_X_GAP = 5 * mm  # 5 mm gap
-LINE_X_RESUME = LINE_X_SPLIT + LINE_X_GAP
-LINE_X_END = LINE_X_RESUME + 35 * mm  # 35 mm second line length
-
-# Vertical line starting point
-VERTICAL_LINE_X = LINE_X_SPLIT
-VERTICAL_LINE_Y_START = LINE_Y
-VERTICAL_LINE_Y_END = LINE_Y - (155 * mm)  # 15.5 cm down
-
 # Calendar settings
 year, month = 2026, 1
-cal = calendar.Calendar(firstweekday=0)
-month_name_full = calendar.month_name[month].upper()  # full month name
-month_name_short = calendar.month_name[month][:3].upper()
-
-# Dot settings
-DOT_RADIUS = 0.25 * mm  # smaller dots
-LINE_WIDTH = DOT_RADIUS * 2
-GREY_LINE_WIDTH = DOT_RADIUS * 1.2  # slightly thinner grey line
-
-# Fonts
-TEXT_FONT_FILE = "Merienda/static/Merienda-Medium.ttf"
-BOLD_FONT_FILE = "Merienda/static/Merienda-Black.ttf"
-LIGHT_FONT_FILE = "Merienda/static/Merienda-Light.ttf"
-LIGHT_FONT = "Merienda_light"
-TEXT_FONT = "Merienda_medium"
-BOLD_FONT = "Merienda_black"
-
-# Register custom fonts
-pdfmetrics.registerFont(TTFont(TEXT_FONT, TEXT_FONT_FILE))
-pdfmetrics.registerFont(TTFont(BOLD_FONT, BOLD_FONT_FILE))
-pdfmetrics.registerFont(TTFont(LIGHT_FONT, LIGHT_FONT_FILE))
-
-
-def draw_dot_grid(c, mirror_margins=False):
-    c.setFillGray(0.7)
-    left_margin = MARGIN_LEFT
-    right_margin = MARGIN_RIGHT
-    if mirror_margins:
-        left_margin, right_margin = MARGIN_RIGHT, MARGIN_LEFT
-
-    x = left_margin
-    while x <= PAGE_WIDTH - right_margin:
-        y = DOT_SPACING
-        while y <= PAGE_HEIGHT - DOT_SPACING:
-            c.circle(x, y, DOT_RADIUS, fill=1, stroke=0)
-            y += DOT_SPACING
-        x += DOT_SPACING
-    c.setFillGray(0)
-
-
-def draw_text_in_cell(
-    c, text, x, y, font_name=TEXT_FONT, font_size=9, color=colors.black
+FIRST_WEEKDAY = calendar.MONDAY
+
+# Layout of the spread in dot pitches (A5 with 5 mm pitch in brackets)
+RIGHT_BLOCK_DOTS = 7  # right-hand calendar column (35 mm)
+DAY_ROWS = 31  # timeline rows, one per day (vertical line 155 mm)
+MIN_TIMELINE_DOTS = 4
+
+
+@lru_cache(maxsize=None)
+def spread_table(layout):
+    """
+    Line positions of the monthly spread for a layout.
+
+    The timeline takes the width left of the 7-dot calendar column and one
+    row per day, so the page must be at least 31 pitches tall below the
+    header.
+    """
+    dot_spacing = layout.dot_spacing
+    page_dots = int(layout.page_height / dot_spacing + 1e-6)
+    top_dots = page_dots - 2  # header line, 2nd dot row from top
+    next_month_gap = min(2, top_dots - DAY_ROWS - 1)  # (10 mm)
+    usable_dots = len(layout.dot_columns) - 1
+    timeline_dots = usable_dots - RIGHT_BLOCK_DOTS - 1  # (85 mm)
+    if next_month_gap < 1 or timeline_dots < MIN_TIMELINE_DOTS:
+        raise ValueError(
+            f"{layout.paper} with {layout.pitch_mm} mm pitch is too small for "
+            f"the monthly spread, try a smaller dot pitch"
+        )
+
+    line_y = layout.page_height - (2 * dot_spacing)
+    line_x_start = layout.margin_left
+    line_x_split = line_x_start + timeline_dots * dot_spacing
+    line_x_resume = line_x_split + dot_spacing  # (5 mm gap)
+    vertical_line_y_end = line_y - DAY_ROWS * dot_spacing
+    return {
+        "line_y": line_y,
+        "line_x_start": line_x_start,
+        "line_x_split": line_x_split,
+        "line_x_resume": line_x_resume,
+        "line_x_end": line_x_resume + RIGHT_BLOCK_DOTS * dot_spacing,
+        "vertical_line_y_end": vertical_line_y_end,
+        "next_month_y": vertical_line_y_end - next_month_gap * dot_spacing,
+        "right_block_width": RIGHT_BLOCK_DOTS * dot_spacing,
+    }
+
+
+@lru_cache(maxsize=None)
+def second_page_table(layout):
+    """Heading offsets of the second page, MONTHLY TASKS keeps 7 rows."""
+    page_dots = int(layout.page_height / layout.dot_spacing + 1e-6)
+    rest_dots = page_dots - 2 - 7
+    # ADMINISTRATIVE, HOME and OTHER share the rest 12:11:10 (60/55 mm on A5)
+    line_spacings = [0, 7, round(rest_dots * 12 / 33), round(rest_dots * 11 / 33)]
+    return [dots * layout.dot_spacing for dots in line_spacings]
+
+
+def draw_bullet_line(
+    c, text, x, y, font_name=TEXT_FONT, font_size=10, bullet_size=12, layout=None
 ):
-    c.setFont(font_name, font_size)
-    c.setFillColor(color)
-    text_width = c.stringWidth(text, font_name, font_size)
-    ascent = c._fontsize * 0.8
-    descent = c._fontsize * 0.2
-    text_height = ascent + descent
-    cx = x + (DOT_SPACING - text_width) / 2
-    cy = y + (DOT_SPACING - text_height) / 2 + descent - TEXT_VERTICAL_ADJUST
-    c.drawString(cx, cy, text)
-    c.setFillColor(colors.black)
-
-
-def draw_text_vertically_centered(c, text, x, y, font_name=TEXT_FONT, font_size=11):
-    c.setFont(font_name, font_size)
-    cy = y + (DOT_SPACING - font_size * 0.8) / 2
-    c.drawString(x, cy, text)
-
-
-def draw_text_across_grid(c, text, start_x, base_y, font_name=BOLD_FONT, font_size=11):
-    c.setFont(font_name, font_size)
-    x = start_x
-    for letter in text:
-        draw_text_in_cell(c, letter, x, base_y, font_name, font_size)
-        x += DOT_SPACING
-
-
-def draw_first_page(c):
-    draw_dot_grid(c)
-    c.saveState()
-    c.translate(PAGE_WIDTH / 2, PAGE_HEIGHT / 2)
-    c.rotate(90)  # 90 degrees counterclockwise
-    font_size = 80
-    c.setFont(TEXT_FONT, font_size)
-    text_width = c.stringWidth(month_name_full, TEXT_FONT, font_size)
-    c.drawString(-text_width / 2, -font_size / 2, month_name_full)
-    c.restoreState()
-
-
-def draw_bullet_line(c, text, x, y, font_name=TEXT_FONT, font_size=10, bullet_size=12):
+    layout = layout or get_layout()
     # Draw the bullet
     bullet = "• "
-    c.setFont(font_name, bullet_size)
-    bullet_width = c.stringWidth(bullet, font_name, bullet_size)
-    draw_text_vertically_centered(c, bullet, x, y, font_name, bullet_size)
+    bullet_width = c.stringWidth(bullet, font_name, bullet_size * layout.font_scale)
+    draw_text_vertically_centered(
+        c, bullet, x, y, font_name, bullet_size, layout=layout
+    )
 
     # Draw the text next to it
-    c.setFont(font_name, font_size)
     draw_text_vertically_centered(
-        c, text, x + bullet_width + 2, y, font_name, font_size
+        c,
+        text,
+        x + bullet_width + 2 * layout.font_scale,
+        y,
+        font_name,
+        font_size,
+        layout=layout,
     )
 
 
-def draw_second_page(c):
-    draw_dot_grid(c, mirror_margins=True)
+def draw_first_page(c, layout=None, month=month):
+    month_name_full = calendar.month_name[month].upper()  # full month name
+    draw_title_page(c, month_name_full, layout=layout)
+
+
+def draw_second_page(c, layout=None):
+    layout = layout or get_layout()
+    dot_spacing = layout.dot_spacing
+    draw_dot_grid(c, mirror_margins=True, layout=layout)
     headings = ["MONTHLY TASKS", "ADMINISTRATIVE", "HOME", "OTHER"]
-    line_spacings = [0, 35 * mm, 60 * mm, 55 * mm]
-    current_y = PAGE_HEIGHT - (2 * DOT_SPACING)
+    line_spacings = second_page_table(layout)
+    current_y = layout.page_height - (2 * dot_spacing)
 
     for i, heading in enumerate(headings):
         # c.setLineWidth(LINE_WIDTH)
         # c.line(MARGIN_RIGHT, current_y, PAGE_WIDTH - MARGIN_LEFT, current_y)
-        draw_text_vertically_centered(c, heading, MARGIN_RIGHT, current_y, TEXT_FONT)
+        draw_text_vertically_centered(
+            c, heading, layout.margin_right, current_y, TEXT_FONT, layout=layout
+        )
         # If we're at MONTHLY TASKS, add the bullet list
         if heading == "MONTHLY TASKS":
             tasks = [
@@ -144,57 +130,79 @@ def draw_second_page(c):
             ]
 
             bullet_font_size = 10
-            task_y = current_y - DOT_SPACING  # a bit of space below heading
+            task_y = current_y - dot_spacing  # a bit of space below heading
 
             for task in tasks:
-                x_pos = MARGIN_RIGHT + DOT_SPACING / 2 - 1
+                x_pos = layout.margin_right + dot_spacing / 2 - 1
                 draw_bullet_line(
-                    c, task, x_pos, task_y, LIGHT_FONT, bullet_font_size, bullet_size=12
+                    c,
+                    task,
+                    x_pos,
+                    task_y,
+                    LIGHT_FONT,
+                    bullet_font_size,
+                    bullet_size=12,
+                    layout=layout,
                 )
-                task_y -= DOT_SPACING  # skip one grid row between tasks
+                task_y -= dot_spacing  # skip one grid row between tasks
 
         if i < len(line_spacings) - 1:
             current_y -= line_spacings[i + 1]
 
 
-def draw_layout(c):
-    c.setLineWidth(LINE_WIDTH)
-    c.line(LINE_X_START, LINE_Y, LINE_X_SPLIT, LINE_Y)
-    c.line(LINE_X_RESUME, LINE_Y, LINE_X_END, LINE_Y)
-    c.line(VERTICAL_LINE_X, VERTICAL_LINE_Y_START, VERTICAL_LINE_X, VERTICAL_LINE_Y_END)
+def draw_layout(c, overlay=None, layout=None, year=year, month=month):
+    layout = layout or get_layout()
+    table = spread_table(layout)
+    dot_spacing = layout.dot_spacing
+    line_y = table["line_y"]
+    line_x_start = table["line_x_start"]
+    line_x_split = table["line_x_split"]
+    line_x_resume = table["line_x_resume"]
+    line_x_end = table["line_x_end"]
+    right_block_width = table["right_block_width"]
 
-    draw_text_vertically_centered(c, "TIMELINE", LINE_X_START, LINE_Y, TEXT_FONT)
+    c.setLineWidth(layout.line_width)
+    c.line(line_x_start, line_y, line_x_split, line_y)
+    c.line(line_x_resume, line_y, line_x_end, line_y)
+    c.line(line_x_split, line_y, line_x_split, table["vertical_line_y_end"])
 
-    sep_text = month_name_short
-    total_width = len(sep_text) * DOT_SPACING
-    sep_start_x = LINE_X_RESUME + (35 * mm - total_width) / 2
-    draw_text_across_grid(c, sep_text, sep_start_x, LINE_Y, BOLD_FONT)
+    draw_text_vertically_centered(
+        c, "TIMELINE", line_x_start, line_y, TEXT_FONT, layout=layout
+    )
 
-    new_line_y = VERTICAL_LINE_Y_END - 10 * mm
-    c.line(LINE_X_START, new_line_y, LINE_X_END, new_line_y)
-    draw_text_vertically_centered(c, "NEXT MONTH", LINE_X_START, new_line_y, TEXT_FONT)
+    sep_text = calendar.month_name[month][:3].upper()
+    total_width = len(sep_text) * dot_spacing
+    sep_start_x = line_x_resume + (right_block_width - total_width) / 2
+    draw_text_across_grid(c, sep_text, sep_start_x, line_y, BOLD_FONT, layout=layout)
 
-    top_35mm_y = LINE_Y
-    monthly_tasks_y = top_35mm_y - 40 * mm
-    monthly_tasks_line_length = 35 * mm
+    new_line_y = table["next_month_y"]
+    c.line(line_x_start, new_line_y, line_x_end, new_line_y)
+    draw_text_vertically_centered(
+        c, "NEXT MONTH", line_x_start, new_line_y, TEXT_FONT, layout=layout
+    )
+
+    monthly_tasks_y = line_y - 8 * dot_spacing  # (40 mm)
     c.line(
-        LINE_X_RESUME,
+        line_x_resume,
         monthly_tasks_y,
-        LINE_X_RESUME + monthly_tasks_line_length,
+        line_x_resume + right_block_width,
         monthly_tasks_y,
     )
     draw_text_vertically_centered(
         c,
         "MONTHLY TASKS",
-        LINE_X_RESUME,
+        line_x_resume,
         monthly_tasks_y,
         TEXT_FONT,
+        layout=layout,
     )
-    c.line(LINE_X_RESUME, monthly_tasks_y, LINE_X_RESUME, monthly_tasks_y - 5 * mm)
+    c.line(line_x_resume, monthly_tasks_y, line_x_resume, monthly_tasks_y - dot_spacing)
 
-    legend_y = monthly_tasks_y - 15 * mm
-    c.line(LINE_X_RESUME, legend_y, LINE_X_RESUME + monthly_tasks_line_length, legend_y)
-    draw_text_vertically_centered(c, "LEGEND", LINE_X_RESUME, legend_y, TEXT_FONT)
+    legend_y = monthly_tasks_y - 3 * dot_spacing  # (15 mm)
+    c.line(line_x_resume, legend_y, line_x_resume + right_block_width, legend_y)
+    draw_text_vertically_centered(
+        c, "LEGEND", line_x_resume, legend_y, TEXT_FONT, layout=layout
+    )
 
     additional_texts = [
         "Call Grandma",
@@ -214,66 +222,123 @@ def draw_layout(c):
         "Schulferien",
         "Holidays",
     ]
-    text_y = legend_y - DOT_SPACING
+    text_y = legend_y - dot_spacing
     smaller_font_size = 10  # 1 size smaller
     for line in additional_texts:
         if line == "":
-            text_y -= DOT_SPACING
+            text_y -= dot_spacing
             continue
+        if overlay is not None:
+            draw_legend_swatch(c, line, line_x_resume, text_y, dot_spacing)
         draw_text_vertically_centered(
-            c, line, LINE_X_RESUME + 5 * mm, text_y, TEXT_FONT, smaller_font_size
+            c,
+            line,
+            line_x_resume + dot_spacing,
+            text_y,
+            TEXT_FONT,
+            smaller_font_size,
+            layout=layout,
         )
-        text_y -= DOT_SPACING
+        text_y -= dot_spacing
 
     # Calendar grid with colored weekends and grey lines under Sundays
     days_in_month = calendar.monthrange(year, month)[1]
-    y = LINE_Y - DOT_SPACING
+    y = line_y - dot_spacing
     for d in range(1, days_in_month + 1):
         weekday = calendar.weekday(year, month, d)
-        color = colors.red if weekday >= 5 else colors.black
-        draw_text_in_cell(c, str(d), LINE_X_START, y, TEXT_FONT, 9, color=color)
+        color = "red" if weekday >= 5 else "black"
+        overlay_color = mark_day(
+            c, overlay, date(year, month, d), line_x_start, y, dot_spacing
+        )
+        color = overlay_color or color
+        draw_text_in_cell(
+            c, str(d), line_x_start, y, TEXT_FONT, 9, color=color, layout=layout
+        )
         if weekday == 6:
-            line_y = y
-            c.setStrokeColor(colors.lightgrey)
-            c.setLineWidth(GREY_LINE_WIDTH)
+            c.setStrokeColor("lightgrey")
+            c.setLineWidth(layout.grey_line_width)
             c.line(
-                LINE_X_START + 2 * DOT_SPACING, line_y, VERTICAL_LINE_X - 5 * mm, line_y
+                line_x_start + 2 * dot_spacing, y, line_x_split - dot_spacing, y
             )
-            c.setStrokeColor(colors.black)
-        y -= DOT_SPACING
+            c.setStrokeColor("black")
+        y -= dot_spacing
 
     # Draw calendar on the right
-    start_x = LINE_X_RESUME
-    start_y = LINE_Y - DOT_SPACING
-    week_y = start_y
-    for week in cal.monthdayscalendar(year, month):
-        x = start_x
-        for day in week:
-            if day != 0:
-                draw_text_in_cell(c, str(day), x, week_y, TEXT_FONT, 9)
-            x += DOT_SPACING
-        week_y -= DOT_SPACING
-
-
-def create_pdf(filename=None):
-    if filename is None:
-        filename = f"bullet_journal_{year}_{month}.pdf"
+    draw_mini_calendar(
+        c,
+        year,
+        month,
+        line_x_resume,
+        line_y - dot_spacing,
+        layout=layout,
+        first_weekday=FIRST_WEEKDAY,
+    )
+
 
-    c = canvas.Canvas(filename, pagesize=A5)
+def draw_pages(c, overlay=None, layout=None, year=year, month=month):
+    """Draw the four pages of the month, shared by the PDF and SVG output."""
+    layout = layout or get_layout()
     # First page
-    draw_first_page(c)
+    draw_first_page(c, layout=layout, month=month)
     c.showPage()
     # Second page
-    draw_second_page(c)
+    draw_second_page(c, layout=layout)
     c.showPage()
     # Third page
-    draw_dot_grid(c)
-    draw_layout(c)
+    draw_dot_grid(c, layout=layout)
+    draw_layout(c, overlay, layout=layout, year=year, month=month)
     c.showPage()
     # Fourth page
-    draw_dot_grid(c, mirror_margins=True)
+    draw_dot_grid(c, mirror_margins=True, layout=layout)
     c.showPage()
-    c.save()
+
+
+def create_pdf(
+    filename=None,
+    sheet=None,
+    creep=0,
+    profile="default",
+    overlay_sources=None,
+    paper="A5",
+    pitch_mm=5,
+    year=year,
+    month=month,
+    deterministic=False,
+):
+    """
+    Build the monthly spread. overlay_sources maps a legend category to
+    ICS/CSV files, see overlay.py; the other options are those of
+    render_pdf. A6 with a 5 mm pitch raises ValueError: the 31 day rows of
+    the timeline do not fit on the page, use pitch_mm=4.
+    """
+    layout = get_layout(paper, pitch_mm)
+    if filename is None:
+        filename = f"bullet_journal_{year}_{month}.pdf"
+    overlay = build_index(overlay_sources, [year]) if overlay_sources else None
+    render_pdf(
+        draw_pages,
+        filename,
+        layout,
+        sheet=sheet,
+        creep=creep,
+        profile=profile,
+        deterministic=deterministic,
+        overlay=overlay,
+        year=year,
+        month=month,
+    )
+
+
+def create_svg(
+    filename=None, overlay_sources=None, paper="A5", pitch_mm=5, year=year, month=month
+):
+    layout = get_layout(paper, pitch_mm)
+    if filename is None:
+        filename = f"bullet_journal_{year}_{month}.svg"
+    overlay = build_index(overlay_sources, [year]) if overlay_sources else None
+    return render_svg(
+        draw_pages, filename, layout, overlay=overlay, year=year, month=month
+    )
 
 
 if __name__ == "__main__":
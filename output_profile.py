@@ -0,0 +1,113 @@
+import re
+
+# --- SETTINGS ---
+# Output profiles for create_pdf.
+#   page_compression: reportlab content-stream compression (0/1)
+#   flate_level:      zlib level used when re-compressing streams afterwards
+#   object_streams:   pack objects into compressed object streams (PDF 1.5)
+#   linearize:        "fast web view", first page displays before full download
+#   verify_subsets:   check that all embedded Merienda fonts are subsets
+# Post-processing (flate_level, object_streams, linearize) needs pikepdf.
+PROFILES = {
+    "default": {
+        "page_compression": None,
+        "flate_level": None,
+        "object_streams": False,
+        "linearize": False,
+        "verify_subsets": False,
+    },
+    "compact": {
+        "page_compression": 1,
+        "flate_level": 9,
+        "object_streams": True,
+        "linearize": False,
+        "verify_subsets": True,
+    },
+    "web": {
+        "page_compression": 1,
+        "flate_level": 9,
+        "object_streams": True,
+        "linearize": True,
+        "verify_subsets": True,
+    },
+}
+
+SUBSET_FONT_NAME = re.compile(rb"/BaseFont\s*/([A-Z]{6}\+)?(Merienda[\w-]*)")
+
+
+def get_profile(profile):
+    if profile not in PROFILES:
+        raise ValueError(
+            f"Unknown output profile {profile!r}, expected one of {sorted(PROFILES)}"
+        )
+    return PROFILES[profile]
+
+
+def canvas_options(profile="default", deterministic=False):
+    """
+    Keyword arguments for the reportlab canvas under this profile. In
+    deterministic mode reportlab's invariant mode fixes the creation date
+    (SOURCE_DATE_EPOCH if set, else 2000-01-01) and derives the document ID
+    from the content, so identical inputs give identical bytes.
+    """
+    settings = get_profile(profile)
+    options = {"pageCompression": settings["page_compression"]}
+    if deterministic:
+        options["invariant"] = 1
+    return options
+
+
+def verify_font_subsets(filename):
+    """
+    Raise if a Merienda font is embedded in full instead of as a subset.
+    Subset fonts carry a six letter tag, e.g. /AAAAAA+Merienda.
+    """
+    with open(filename, "rb") as f:
+        data = f.read()
+    full_fonts = [
+        name.decode() for tag, name in SUBSET_FONT_NAME.findall(data) if not tag
+    ]
+    if full_fonts:
+        raise ValueError(f"{filename}: fonts not subset: {', '.join(full_fonts)}")
+
+
+def finalize_pdf(filename, profile="default", deterministic=False):
+    """
+    Apply the post-processing steps of the profile to a saved PDF. In
+    deterministic mode qpdf derives the new document ID from the content
+    instead of generating a random one.
+    """
+    settings = get_profile(profile)
+    if settings["verify_subsets"]:
+        verify_font_subsets(filename)
+
+    if not (
+        settings["flate_level"] is not None
+        or settings["object_streams"]
+        or settings["linearize"]
+    ):
+        return
+
+    try:
+        import pikepdf
+    except ImportError as e:
+        raise ImportError(
+            f"Output profile {profile!r} needs pikepdf (pip install pikepdf)"
+        ) from e
+
+    if settings["flate_level"] is not None:
+        pikepdf.settings.set_flate_compression_level(settings["flate_level"])
+    object_stream_mode = (
+        pikepdf.ObjectStreamMode.generate
+        if settings["object_streams"]
+        else pikepdf.ObjectStreamMode.preserve
+    )
+    with pikepdf.open(filename, allow_overwriting_input=True) as pdf:
+        pdf.save(
+            filename,
+            compress_streams=True,
+            recompress_flate=settings["flate_level"] is not None,
+            object_stream_mode=object_stream_mode,
+            linearize=settings["linearize"],
+            deterministic_id=deterministic,
+        )
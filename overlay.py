@@ -0,0 +1,284 @@
+import os
+import warnings
+from datetime import date, datetime, timedelta
+
+# Parsing and caching imports (csv, hashlib, pickle) are deferred to the
+# functions using them; drawing journals without an overlay never needs them.
+
+# --- SETTINGS ---
+OVERLAY_CACHE_DIR = ".overlay_cache"
+CACHE_VERSION = 2  # bump when the cached event tuples change
+
+# How each category is marked on a day cell, listed in drawing order:
+#   fill:      cell background
+#   text:      colour of the day number
+#   ring:      circle around the day number
+#   underline: short line below the day number
+# Colours are reportlab colour names or hex strings.
+CATEGORY_STYLES = {
+    "schulferien": ("fill", "#D9EBFF"),
+    "trips": ("fill", "#DBF5DB"),
+    "feiertage": ("text", "red"),
+    "birthdays": ("ring", "#D94D99"),
+    "important": ("ring", "red"),
+    "other": ("underline", "grey"),
+}
+
+# Legend labels as printed on the pages, mapped to overlay categories
+LEGEND_CATEGORIES = {
+    "Important": "important",
+    "Birthdays": "birthdays",
+    "Other": "other",
+    "Trips": "trips",
+    "Schulferien": "schulferien",
+    "NRW Feiertage": "feiertage",
+    "Holidays": "feiertage",
+}
+
+
+# --- PARSING ---
+# Events are (start, end, until) with an inclusive end date. until is None
+# for a single event, else the last date a yearly occurrence may start on
+# (date.max when the event repeats forever).
+
+
+def in_year(day, year):
+    """Move day into year; 29 February becomes 1 March in other years."""
+    try:
+        return day.replace(year=year)
+    except ValueError:
+        return date(year, 3, 1)
+
+
+def parse_ics_date(value, params):
+    """Return (date, is_all_day) for a DTSTART/DTEND value."""
+    all_day = "VALUE=DATE" in params or len(value) == 8
+    return datetime.strptime(value[:8], "%Y%m%d").date(), all_day
+
+
+def unfold_ics_lines(f):
+    """Yield logical ICS lines, joining folded continuation lines."""
+    pending = None
+    for raw in f:
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t"):
+            if pending is not None:
+                pending += line[1:]
+            continue
+        if pending is not None:
+            yield pending
+        pending = line
+    if pending is not None:
+        yield pending
+
+
+def parse_rrule(value, start, path):
+    """
+    Return the until date of an RRULE value. Only yearly rules are
+    supported, optionally bounded by UNTIL or COUNT; BYMONTH/BYMONTHDAY may
+    repeat the start date. Other rules mark their first occurrence only,
+    with a warning.
+    """
+    parts = dict(part.partition("=")[::2] for part in value.split(";") if part)
+    freq = parts.pop("FREQ", "")
+    unsupported = freq != "YEARLY" or parts.pop("INTERVAL", "1") != "1"
+    if parts.pop("BYMONTH", str(start.month)) != str(start.month):
+        unsupported = True
+    if parts.pop("BYMONTHDAY", str(start.day)) != str(start.day):
+        unsupported = True
+    until, count = parts.pop("UNTIL", None), parts.pop("COUNT", None)
+    if unsupported or parts.keys() - {"WKST"}:
+        warnings.warn(
+            f"{path}: unsupported RRULE {value!r} starting {start}, "
+            f"only the first occurrence is marked",
+            stacklevel=2,
+        )
+        return None
+    if until:
+        return datetime.strptime(until[:8], "%Y%m%d").date()
+    if count:
+        return in_year(start, start.year + int(count) - 1)
+    return date.max
+
+
+def iter_ics_events(path):
+    """Stream the VEVENTs of an ICS file without reading it at once."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        event = None
+        for line in unfold_ics_lines(f):
+            if line == "BEGIN:VEVENT":
+                event = {}
+                continue
+            if line == "END:VEVENT":
+                if event and "start" in event:
+                    start, start_all_day = event["start"]
+                    end = start
+                    if "end" in event:
+                        end, end_all_day = event["end"]
+                        # All-day DTEND is exclusive
+                        if end_all_day and end > start:
+                            end -= timedelta(days=1)
+                    until = None
+                    if "rrule" in event:
+                        until = parse_rrule(event["rrule"], start, path)
+                    yield start, max(start, end), until
+                event = None
+                continue
+            if event is None or ":" not in line:
+                continue
+            name, value = line.split(":", 1)
+            key, _, params = name.partition(";")
+            if key == "DTSTART":
+                event["start"] = parse_ics_date(value, params)
+            elif key == "DTEND":
+                event["end"] = parse_ics_date(value, params)
+            elif key == "RRULE":
+                event["rrule"] = value
+
+
+def iter_csv_events(path):
+    """
+    Stream events from a CSV file with a header row. Columns: ``start``
+    (YYYY-MM-DD), optional ``end`` (inclusive) and optional ``yearly``,
+    which repeats the event every year from its start on.
+    """
+    import csv
+
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            start = date.fromisoformat(row["start"].strip())
+            end = row.get("end") or ""
+            end = date.fromisoformat(end.strip()) if end.strip() else start
+            yearly = (row.get("yearly") or "").strip().lower()
+            until = date.max if yearly in ("1", "yes", "true") else None
+            yield start, max(start, end), until
+
+
+def parse_events(path):
+    if path.lower().endswith(".csv"):
+        return list(iter_csv_events(path))
+    return list(iter_ics_events(path))
+
+
+def cache_path(path):
+    import hashlib
+
+    stat = os.stat(path)
+    key = f"{CACHE_VERSION}:{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+    digest = hashlib.sha1(key.encode()).hexdigest()
+    return os.path.join(OVERLAY_CACHE_DIR, f"{digest}.pickle")
+
+
+def load_events(path):
+    """Parse an ICS/CSV file, reusing the cached result if it is unchanged."""
+    import pickle
+
+    cached = cache_path(path)
+    if os.path.exists(cached):
+        with open(cached, "rb") as f:
+            return pickle.load(f)
+    events = parse_events(path)
+    os.makedirs(OVERLAY_CACHE_DIR, exist_ok=True)
+    with open(cached, "wb") as f:
+        pickle.dump(events, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return events
+
+
+# --- INDEX ---
+
+
+def add_interval(index, category, start, end, first_year, last_year):
+    # Clip to the years being drawn so multi-year files stay cheap
+    start = max(start, date(first_year, 1, 1))
+    end = min(end, date(last_year, 12, 31))
+    day = start
+    while day <= end:
+        index.setdefault(day, set()).add(category)
+        day += timedelta(days=1)
+
+
+def build_index(sources, years):
+    """
+    Build a date -> set of categories index for the given years.
+
+    ``sources`` maps a category (see CATEGORY_STYLES) to one ICS/CSV path
+    or a list of paths. Yearly events (birthdays) repeat in every year up
+    to their UNTIL/COUNT bound, see parse_rrule.
+    """
+    first_year, last_year = min(years), max(years)
+    index = {}
+    for category, paths in sources.items():
+        if isinstance(paths, str):
+            paths = [paths]
+        for path in paths:
+            for start, end, until in load_events(path):
+                if until is None:
+                    add_interval(index, category, start, end, first_year, last_year)
+                    continue
+                length = end - start
+                # The previous year's occurrence may run into the first year
+                for year in range(max(start.year, first_year - 1), last_year + 1):
+                    moved = in_year(start, year)
+                    if moved > until:
+                        break
+                    add_interval(
+                        index, category, moved, moved + length, first_year, last_year
+                    )
+    return index
+
+
+# --- DRAWING ---
+
+
+def draw_mark(c, kind, color, x, y, size):
+    if kind == "fill":
+        c.setFillColor(color)
+        c.rect(x, y, size, size, stroke=0, fill=1)
+        c.setFillColor("black")
+    elif kind == "ring":
+        c.saveState()
+        c.setStrokeColor(color)
+        c.setLineWidth(size * 0.06)
+        c.circle(x + size / 2, y + size / 2, size * 0.42, stroke=1, fill=0)
+        c.restoreState()
+    elif kind == "underline":
+        c.saveState()
+        c.setStrokeColor(color)
+        c.setLineWidth(size * 0.06)
+        c.line(x + size * 0.2, y + size * 0.1, x + size * 0.8, y + size * 0.1)
+        c.restoreState()
+
+
+def mark_day(c, overlay, day, x, y, size):
+    """
+    Draw the overlay marks of ``day`` in the cell at (x, y) and return the
+    text colour to use for the day number, or None to keep the default.
+    """
+    if not overlay:
+        return None
+    categories = overlay.get(day)
+    if not categories:
+        return None
+    text_color = None
+    for category, (kind, color) in CATEGORY_STYLES.items():
+        if category not in categories:
+            continue
+        if kind == "text":
+            text_color = color
+        else:
+            draw_mark(c, kind, color, x, y, size)
+    return text_color
+
+
+def draw_legend_swatch(c, label, x, y, size):
+    """Draw the mark used for a legend label in the cell at (x, y)."""
+    style = CATEGORY_STYLES.get(LEGEND_CATEGORIES.get(label))
+    if style is None:
+        return
+    kind, color = style
+    if kind == "text":
+        c.setFillColor(color)
+        c.circle(x + size / 2, y + size / 2, size * 0.2, stroke=0, fill=1)
+        c.setFillColor("black")
+    else:
+        draw_mark(c, kind, color, x, y, size)
@@ -0,0 +1,372 @@
+"""
+Local journal generation service.
+
+Build jobs are queued in a bounded asyncio queue and dispatched to warm
+worker processes running the create_pdf entry points. When the queue is full
+new jobs are rejected right away (backpressure) instead of piling up. A job
+that overruns its timeout has its worker killed and replaced, so a hanging
+job never holds on to capacity.
+
+Protocol: newline-delimited JSON over TCP, one request per line.
+
+    {"type": "month", "year": 2026, "month": 3, "overrides": {"paper": "B6"}}
+    -> {"status": "ok", "id": 7, "filename": "...", "latency_ms": 812.4, ...}
+    {"cmd": "metrics"}
+    -> {"queue_depth": 0, "completed": 7, "latency_ms": {"p50": ...}, ...}
+
+Run with ``python service.py [--port 8765] [--workers N]``; loadgen.py
+drives a running instance.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# --- SETTINGS ---
+HOST = "127.0.0.1"
+PORT = 8765
+QUEUE_SIZE = 64
+JOB_TIMEOUT = 60  # seconds per job, from dispatch to finished PDF
+OUTPUT_DIR = "build"
+LATENCY_WINDOW = 10_000  # latencies kept for the percentiles
+THROUGHPUT_WINDOW = 60  # seconds
+
+# create_pdf arguments a client may set; the output path and anything that
+# reads local files (overlay_sources, log_csv) stay under the service's control
+OVERRIDE_KEYS = {"paper", "pitch_mm", "profile", "sheet", "creep", "deterministic"}
+YEAR_RANGE = (1900, 2200)
+
+JOB_MODULES = {
+    "year": "year_spread",
+    "month": "month_spread",
+    "books": "book_movie_spread",
+}
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class JobError(Exception):
+    pass
+
+
+# --- WORKER SIDE ---
+
+
+def warm_worker():
+    """Import the spreads and load the fonts once per worker process."""
+    import importlib
+
+    from drawing import register_fonts
+
+    for module in JOB_MODULES.values():
+        importlib.import_module(module)
+    register_fonts()
+
+
+def run_job(job_type, kwargs):
+    """Build one journal in a worker process, return the seconds it took."""
+    import importlib
+
+    module = importlib.import_module(JOB_MODULES[job_type])
+    start = time.perf_counter()
+    module.create_pdf(**kwargs)
+    return time.perf_counter() - start
+
+
+def worker_main(conn):
+    """Worker process: run the jobs sent over ``conn`` until it is closed."""
+    warm_worker()
+    conn.send(("ready", None))
+    while True:
+        try:
+            job_type, kwargs = conn.recv()
+        except EOFError:
+            return
+        try:
+            conn.send(("ok", run_job(job_type, kwargs)))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+def int_field(job, key, low, high):
+    # JSON numbers only: bools are ints to Python, 1e400 parses as inf
+    value = job[key]
+    is_int = isinstance(value, int) and not isinstance(value, bool)
+    if not (is_int and low <= value <= high):
+        raise ValueError(f"{key} must be an integer from {low} to {high}")
+    return value
+
+
+def job_kwargs(job_id, job, output_dir):
+    """Validate a job request and map it onto create_pdf keyword arguments."""
+    job_type = job.get("type")
+    if job_type not in JOB_MODULES:
+        raise ValueError(f"Unknown job type {job_type!r}")
+    overrides = job.get("overrides") or {}
+    if not isinstance(overrides, dict):
+        raise ValueError("overrides must be an object")
+    unknown = set(overrides) - OVERRIDE_KEYS
+    if unknown:
+        raise ValueError(
+            f"Unsupported overrides {sorted(unknown)}, "
+            f"expected some of {sorted(OVERRIDE_KEYS)}"
+        )
+    kwargs = dict(overrides)
+    name = [job_type]
+    if job_type in ("year", "month") and "year" in job:
+        kwargs["year"] = int_field(job, "year", *YEAR_RANGE)
+        name.append(str(kwargs["year"]))
+    if job_type == "month" and "month" in job:
+        kwargs["month"] = int_field(job, "month", 1, 12)
+        name.append(str(kwargs["month"]))
+    # Concurrent jobs must not share the default file names
+    name.append(str(job_id))
+    kwargs["filename"] = os.path.join(output_dir, "_".join(name) + ".pdf")
+    return job_type, kwargs
+
+
+# --- SERVICE ---
+
+
+class Worker:
+    """
+    One warm worker process and its pipe. Unlike a pool worker it can be
+    killed, which is how a job that overruns its timeout frees its slot.
+    """
+
+    def __init__(self, context, waiter):
+        self.context = context
+        self.waiter = waiter  # threads blocking on the pipe off the event loop
+        self.process = None
+        self.conn = None
+
+    async def start(self):
+        self.conn, child_conn = self.context.Pipe()
+        self.process = self.context.Process(
+            target=worker_main, args=(child_conn,), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        await self.receive(None)  # fonts loaded
+
+    async def receive(self, timeout):
+        loop = asyncio.get_running_loop()
+        if not await loop.run_in_executor(self.waiter, self.conn.poll, timeout):
+            raise asyncio.TimeoutError
+        return self.conn.recv()
+
+    async def run(self, job_type, kwargs, timeout):
+        """Run one job and return its run time in the worker, in seconds."""
+        try:
+            self.conn.send((job_type, kwargs))
+            status, value = await self.receive(timeout)
+        except asyncio.TimeoutError:
+            await self.restart()
+            raise
+        except (EOFError, OSError):
+            await self.restart()
+            raise JobError("Worker process exited") from None
+        if status == "error":
+            raise JobError(value)
+        return value
+
+    async def restart(self):
+        self.close()
+        await self.start()
+
+    def close(self):
+        if self.process is not None:
+            self.process.kill()
+            self.process.join()
+            self.conn.close()
+            self.process = None
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = round(q / 100 * (len(sorted_values) - 1))
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+class GenerationService:
+    def __init__(
+        self,
+        workers=None,
+        queue_size=QUEUE_SIZE,
+        job_timeout=JOB_TIMEOUT,
+        output_dir=OUTPUT_DIR,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.job_timeout = job_timeout
+        self.output_dir = output_dir
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.pool = []
+        self.waiter = None
+        self.dispatchers = []
+        self.job_ids = itertools.count(1)
+        self.started = None
+        self.counts = {"completed": 0, "failed": 0, "timeout": 0, "rejected": 0}
+        self.latencies = deque(maxlen=LATENCY_WINDOW)  # submit to finished, ms
+        self.run_times = deque(maxlen=LATENCY_WINDOW)  # inside the worker, ms
+        self.finished_at = deque()
+
+    async def start(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.waiter = ThreadPoolExecutor(self.workers)
+        # Spawned rather than forked: the service process runs threads
+        context = multiprocessing.get_context("spawn")
+        self.pool = [Worker(context, self.waiter) for _ in range(self.workers)]
+        # Start every worker now so the first jobs do not pay for it
+        await asyncio.gather(*(worker.start() for worker in self.pool))
+        self.started = time.monotonic()
+        self.dispatchers = [
+            asyncio.create_task(self.dispatch(worker)) for worker in self.pool
+        ]
+
+    async def stop(self):
+        for task in self.dispatchers:
+            task.cancel()
+        await asyncio.gather(*self.dispatchers, return_exceptions=True)
+        for worker in self.pool:
+            worker.close()
+        self.waiter.shutdown(wait=True)
+
+    def submit(self, job):
+        """
+        Queue a job and return a future for its result.
+        Raises QueueFullError when the queue is at capacity.
+        """
+        job_id = next(self.job_ids)
+        job_type, kwargs = job_kwargs(job_id, job, self.output_dir)
+        result = asyncio.get_running_loop().create_future()
+        try:
+            item = (job_id, job_type, kwargs, time.monotonic(), result)
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.counts["rejected"] += 1
+            raise QueueFullError(f"Queue full ({self.queue.maxsize} jobs)") from None
+        return result
+
+    async def dispatch(self, worker):
+        while True:
+            job_id, job_type, kwargs, submitted, result = await self.queue.get()
+            response = {"id": job_id, "filename": kwargs["filename"]}
+            try:
+                run_time = await worker.run(job_type, kwargs, self.job_timeout)
+            except asyncio.TimeoutError:
+                self.counts["timeout"] += 1
+                response["status"] = "timeout"
+            except JobError as e:
+                self.counts["failed"] += 1
+                response.update(status="error", error=str(e))
+            except Exception as e:
+                self.counts["failed"] += 1
+                response.update(status="error", error=f"{type(e).__name__}: {e}")
+            else:
+                now = time.monotonic()
+                self.counts["completed"] += 1
+                self.latencies.append((now - submitted) * 1000)
+                self.run_times.append(run_time * 1000)
+                self.finished_at.append(now)
+                response.update(
+                    status="ok",
+                    latency_ms=round((now - submitted) * 1000, 1),
+                    run_ms=round(run_time * 1000, 1),
+                )
+            if not result.done():
+                result.set_result(response)
+            self.queue.task_done()
+
+    def metrics(self):
+        now = time.monotonic()
+        while self.finished_at and now - self.finished_at[0] > THROUGHPUT_WINDOW:
+            self.finished_at.popleft()
+        uptime = now - self.started if self.started else 0
+        window = min(THROUGHPUT_WINDOW, uptime) or 1
+        latencies = sorted(self.latencies)
+        run_times = sorted(self.run_times)
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            **self.counts,
+            "uptime_s": round(uptime, 1),
+            "throughput_per_s": {
+                "overall": round(self.counts["completed"] / (uptime or 1), 3),
+                "last_window": round(len(self.finished_at) / window, 3),
+            },
+            "latency_ms": {f"p{q}": percentile(latencies, q) for q in (50, 90, 95, 99)},
+            "run_ms": {f"p{q}": percentile(run_times, q) for q in (50, 90, 99)},
+        }
+
+    async def handle_client(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("Request must be a JSON object")
+                    if request.get("cmd") == "metrics":
+                        response = self.metrics()
+                    else:
+                        response = await self.submit(request)
+                except QueueFullError as e:
+                    response = {"status": "rejected", "error": str(e)}
+                except (ValueError, TypeError) as e:
+                    response = {"status": "error", "error": str(e)}
+                except Exception as e:
+                    # One bad line must never cost the client its connection
+                    response = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+async def serve(host=HOST, port=PORT, **service_options):
+    service = GenerationService(**service_options)
+    await service.start()
+    server = await asyncio.start_server(service.handle_client, host, port)
+    print(f"Serving on {host}:{port} with {service.workers} workers")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE)
+    parser.add_argument("--timeout", type=float, default=JOB_TIMEOUT)
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    args = parser.parse_args()
+    try:
+        asyncio.run(
+            serve(
+                args.host,
+                args.port,
+                workers=args.workers,
+                queue_size=args.queue_size,
+                job_timeout=args.timeout,
+                output_dir=args.output_dir,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+SVG backend for the journal pages.
+
+SVGCanvas implements the part of the reportlab canvas API that the drawing
+code uses, so every page type renders through the same layout functions as
+the PDF. Forms become <symbol> elements placed with <use>: the dot grid,
+each mini calendar and anything else drawn with beginForm/endForm is
+defined once per file. The dot grid itself is a single pattern-filled
+rectangle tiling one dot symbol instead of ~1,000 circles.
+
+Coordinates stay in PDF points with the origin at the bottom left; every
+page is wrapped in a group that flips the y axis.
+"""
+
+from xml.sax.saxutils import escape
+
+from drawing import BOLD_FONT, LIGHT_FONT, TEXT_FONT
+
+# --- SETTINGS ---
+# CSS classes of the registered fonts: (class, font-weight of Merienda)
+FONT_CLASSES = {
+    TEXT_FONT: ("m", 500),
+    LIGHT_FONT: ("l", 300),
+    BOLD_FONT: ("b", 900),
+}
+FONT_FAMILY = "Merienda, cursive"
+PAGE_GAP = 20  # points between the pages of a book file
+
+FONT_WEIGHTS = "".join(
+    f".{cls}{{font-weight:{weight}}}" for cls, weight in FONT_CLASSES.values()
+)
+STYLE = f"text{{font-family:{FONT_FAMILY};white-space:pre}}{FONT_WEIGHTS}"
+
+
+def fmt(value):
+    """Short number formatting, 1/100 pt is well below anything visible."""
+    text = f"{value:.2f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def gray(level):
+    value = round(level * 255)
+    return f"#{value:02x}{value:02x}{value:02x}"
+
+
+class SVGCanvas:
+    """
+    Record pages as SVG. ``save`` writes all pages into one file, stacked
+    top to bottom and sharing their definitions; ``page_svg`` returns a
+    single page as a standalone document.
+    """
+
+    def __init__(self, filename=None, pagesize=None):
+        from reportlab.lib.pagesizes import A5
+
+        self._filename = filename
+        self._pagesize = pagesize or A5
+        self._defs = {}  # id -> definition markup
+        self._def_uses = {}  # id -> ids referenced by the definition
+        self._pages = []  # (body, used ids)
+        self._state_stack = []
+        self._form_stack = []
+        self._begin_page()
+
+    # --- state ---
+
+    def _init_graphics_state(self):
+        self._fill = "black"
+        self._stroke = "black"
+        self._line_width = 1
+        self._fontname = TEXT_FONT
+        self._fontsize = 10
+        self._groups = 0
+
+    def _begin_page(self):
+        self._out = []
+        self._uses = set()
+        self._init_graphics_state()
+
+    def _state(self):
+        return (
+            self._fill,
+            self._stroke,
+            self._line_width,
+            self._fontname,
+            self._fontsize,
+            self._groups,
+        )
+
+    def _restore(self, state):
+        (
+            self._fill,
+            self._stroke,
+            self._line_width,
+            self._fontname,
+            self._fontsize,
+            self._groups,
+        ) = state
+
+    def _close_groups(self):
+        self._out.append("</g>" * self._groups)
+
+    def saveState(self):
+        # Transforms after this point open groups that restoreState closes
+        self._state_stack.append(self._state())
+        self._groups = 0
+
+    def restoreState(self):
+        self._close_groups()
+        self._restore(self._state_stack.pop())
+
+    def setFillColor(self, color):
+        self._fill = color
+
+    def setStrokeColor(self, color):
+        self._stroke = color
+
+    def setFillGray(self, level):
+        self._fill = gray(level)
+
+    def setStrokeGray(self, level):
+        self._stroke = gray(level)
+
+    def setLineWidth(self, width):
+        self._line_width = width
+
+    def setFont(self, psfontname, size, leading=None):
+        self._fontname = psfontname
+        self._fontsize = size
+
+    def stringWidth(self, text, fontName=None, fontSize=None):
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+
+        return stringWidth(
+            text, fontName or self._fontname, fontSize or self._fontsize
+        )
+
+    def translate(self, dx, dy):
+        self._out.append(f'<g transform="translate({fmt(dx)} {fmt(dy)})">')
+        self._groups += 1
+
+    def rotate(self, theta):
+        self._out.append(f'<g transform="rotate({fmt(theta)})">')
+        self._groups += 1
+
+    # --- shapes ---
+
+    def _paint(self, stroke, fill):
+        """Paint attributes; black fill and no stroke are the SVG defaults."""
+        if not fill:
+            attrs = ' fill="none"'
+        elif self._fill != "black":
+            attrs = f' fill="{self._fill}"'
+        else:
+            attrs = ""
+        if stroke:
+            attrs += f' stroke="{self._stroke}" stroke-width="{fmt(self._line_width)}"'
+        return attrs
+
+    def line(self, x1, y1, x2, y2):
+        self._out.append(
+            f'<path d="M{fmt(x1)} {fmt(y1)}L{fmt(x2)} {fmt(y2)}"'
+            f'{self._paint(1, 0)}/>'
+        )
+
+    def circle(self, x_cen, y_cen, r, stroke=1, fill=0):
+        self._out.append(
+            f'<circle cx="{fmt(x_cen)}" cy="{fmt(y_cen)}" r="{fmt(r)}"'
+            f"{self._paint(stroke, fill)}/>"
+        )
+
+    def rect(self, x, y, width, height, stroke=1, fill=0):
+        self.roundRect(x, y, width, height, 0, stroke, fill)
+
+    def roundRect(self, x, y, width, height, radius, stroke=1, fill=0):
+        corner = f' rx="{fmt(radius)}"' if radius else ""
+        self._out.append(
+            f'<rect x="{fmt(x)}" y="{fmt(y)}" width="{fmt(width)}"'
+            f' height="{fmt(height)}"{corner}{self._paint(stroke, fill)}/>'
+        )
+
+    def drawString(self, x, y, text):
+        font_class = FONT_CLASSES.get(self._fontname)
+        font = (
+            f' class="{font_class[0]}"'
+            if font_class
+            else f' font-family="{escape(self._fontname)}"'
+        )
+        fill = "" if self._fill == "black" else f' fill="{self._fill}"'
+        self._out.append(
+            f'<text{font} font-size="{fmt(self._fontsize)}"{fill}'
+            f' transform="matrix(1 0 0 -1 {fmt(x)} {fmt(y)})">'
+            f"{escape(text)}</text>"
+        )
+
+    def drawDotGrid(self, columns, rows, radius):
+        """
+        Fill the grid of dots at columns x rows with one rectangle tiled by a
+        pattern of the dot symbol. The drawing code calls this instead of
+        drawing the dots one by one when the canvas provides it.
+        """
+        spacing = columns[1] - columns[0]
+        dot = f"dot_{fmt(radius).replace('.', '_')}"
+        if dot not in self._defs:
+            self._add_def(
+                dot,
+                f'<symbol id="{dot}" overflow="visible">'
+                f'<circle r="{fmt(radius)}"/></symbol>',
+            )
+        pattern = f"{dot}_{fmt(spacing).replace('.', '_')}_{self._fill.strip('#')}"
+        x0, y0 = columns[0] - spacing / 2, rows[0] - spacing / 2
+        if pattern not in self._defs:
+            self._add_def(
+                pattern,
+                f'<pattern id="{pattern}" patternUnits="userSpaceOnUse"'
+                f' width="{fmt(spacing)}" height="{fmt(spacing)}">'
+                f'<use href="#{dot}" x="{fmt(spacing / 2)}" y="{fmt(spacing / 2)}"'
+                f' fill="{self._fill}"/></pattern>',
+                uses={dot},
+            )
+        # Tiles start at the origin of the rectangle's user space, so the
+        # rectangle is translated onto the tile of the first dot
+        self._uses.add(pattern)
+        self._out.append(
+            f'<rect transform="translate({fmt(x0)} {fmt(y0)})"'
+            f' width="{fmt(len(columns) * spacing)}"'
+            f' height="{fmt(len(rows) * spacing)}" fill="url(#{pattern})"/>'
+        )
+
+    # --- forms ---
+
+    def _add_def(self, name, markup, uses=()):
+        self._defs[name] = markup
+        self._def_uses[name] = set(uses)
+
+    def hasForm(self, name):
+        return name in self._defs
+
+    def beginForm(self, name, lowerx=0, lowery=0, upperx=None, uppery=None):
+        self._form_stack.append((name, self._out, self._uses, self._state()))
+        self._out = []
+        self._uses = set()
+        self._init_graphics_state()
+
+    def endForm(self, **extra_attributes):
+        self._close_groups()
+        body = "".join(self._out)
+        form_uses = self._uses
+        name, self._out, self._uses, state = self._form_stack.pop()
+        self._add_def(
+            name,
+            f'<symbol id="{name}" overflow="visible">{body}</symbol>',
+            uses=form_uses,
+        )
+        self._restore(state)
+
+    def doForm(self, name):
+        self._uses.add(name)
+        self._out.append(f'<use href="#{name}"/>')
+
+    # --- pages ---
+
+    def showPage(self):
+        self._close_groups()
+        self._pages.append(("".join(self._out), self._uses))
+        self._state_stack = []
+        self._begin_page()
+
+    def _used_defs(self, uses):
+        """Definitions needed by the given ids, dependencies first."""
+        ordered = {}
+
+        def visit(name):
+            if name in ordered:
+                return
+            for dependency in sorted(self._def_uses[name]):
+                visit(dependency)
+            ordered[name] = self._defs[name]
+
+        for name in sorted(uses):
+            visit(name)
+        return "".join(ordered.values())
+
+    def _document(self, width, height, defs, body):
+        return (
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{fmt(width)}pt"'
+            f' height="{fmt(height)}pt" viewBox="0 0 {fmt(width)} {fmt(height)}">'
+            f"<style>{STYLE}</style><defs>{defs}</defs>{body}</svg>"
+        )
+
+    def _page_group(self, body, top):
+        width, height = self._pagesize
+        return (
+            f'<rect y="{fmt(top)}" width="{fmt(width)}" height="{fmt(height)}"'
+            ' fill="white" stroke="#ccc"/>'
+            f'<g transform="matrix(1 0 0 -1 0 {fmt(top + height)})">{body}</g>'
+        )
+
+    @property
+    def page_count(self):
+        return len(self._pages)
+
+    def page_svg(self, index):
+        """One page as a standalone SVG document."""
+        body, uses = self._pages[index]
+        width, height = self._pagesize
+        return self._document(
+            width, height, self._used_defs(uses), self._page_group(body, 0)
+        )
+
+    def book_svg(self):
+        """All pages stacked top to bottom in one SVG document."""
+        width, height = self._pagesize
+        uses = set().union(*(page_uses for _, page_uses in self._pages))
+        groups = [
+            self._page_group(body, i * (height + PAGE_GAP))
+            for i, (body, _) in enumerate(self._pages)
+        ]
+        total_height = len(self._pages) * (height + PAGE_GAP) - PAGE_GAP
+        return self._document(
+            width, max(total_height, 0), self._used_defs(uses), "".join(groups)
+        )
+
+    def save(self):
+        if self._out:
+            self.showPage()
+        if self._filename:
+            with open(self._filename, "w", encoding="utf-8") as f:
+                f.write(self.book_svg())
@@ -0,0 +1,47 @@
+import hashlib
+
+import pytest
+
+import book_movie_spread
+import month_spread
+import year_spread
+
+
+@pytest.fixture(autouse=True)
+def no_source_date_epoch(monkeypatch):
+    # reportlab pins the timestamp whenever SOURCE_DATE_EPOCH is set
+    monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+
+
+def build_twice(tmp_path, module, **options):
+    digests = []
+    for run in range(2):
+        filename = tmp_path / f"run{run}.pdf"
+        module.create_pdf(str(filename), **options)
+        digests.append(hashlib.sha256(filename.read_bytes()).hexdigest())
+    return digests
+
+
+@pytest.mark.parametrize("module", [year_spread, month_spread, book_movie_spread])
+def test_deterministic_output_is_identical(tmp_path, module):
+    first, second = build_twice(tmp_path, module, deterministic=True)
+    assert first == second
+
+
+def test_deterministic_booklet_is_identical(tmp_path):
+    first, second = build_twice(tmp_path, month_spread, sheet="A4", deterministic=True)
+    assert first == second
+
+
+def test_deterministic_web_profile_is_identical(tmp_path):
+    pytest.importorskip("pikepdf")
+    first, second = build_twice(
+        tmp_path, month_spread, profile="web", deterministic=True
+    )
+    assert first == second
+
+
+def test_default_output_differs_between_runs(tmp_path):
+    # Guards against invariant mode leaking into normal builds
+    first, second = build_twice(tmp_path, month_spread)
+    assert first != second
@@ -0,0 +1,110 @@
+import pytest
+from reportlab.lib.pagesizes import A4, A5, landscape
+
+from imposition import booklet_order, make_canvas
+
+
+def test_booklet_order_single_sheet():
+    assert booklet_order(4) == [((3, 0), (1, 2))]
+
+
+def test_booklet_order_pads_with_blanks():
+    assert booklet_order(1) == [((None, 0), (None, None))]
+    assert booklet_order(6) == [((None, 0), (1, None)), ((5, 2), (3, 4))]
+
+
+def test_booklet_order_eight_pages():
+    assert booklet_order(8) == [
+        ((7, 0), (1, 6)),
+        ((5, 2), (3, 4)),
+    ]
+
+
+def test_booklet_order_twelve_pages():
+    assert booklet_order(12) == [
+        ((11, 0), (1, 10)),
+        ((9, 2), (3, 8)),
+        ((7, 4), (5, 6)),
+    ]
+
+
+@pytest.mark.parametrize("page_count", [1, 2, 3, 4, 5, 8, 13, 18, 32])
+def test_booklet_order_uses_every_page_once(page_count):
+    sheets = booklet_order(page_count)
+    assert len(sheets) == (page_count + 3) // 4
+    pages = [
+        page
+        for front, back in sheets
+        for page in front + back
+        if page is not None
+    ]
+    assert sorted(pages) == list(range(page_count))
+
+
+@pytest.mark.parametrize(
+    "sheet, page_count, expected_pages",
+    [("A4", 1, 2), ("A4", 5, 4), ("A4", 18, 10), ("A3", 18, 6)],
+)
+def test_imposed_sheet_count(tmp_path, sheet, page_count, expected_pages):
+    # Guards the reportlab internals BookletCanvas relies on (showPage/save)
+    pikepdf = pytest.importorskip("pikepdf")
+    filename = str(tmp_path / "booklet.pdf")
+    c = make_canvas(filename, sheet=sheet)
+    for page in range(page_count):
+        c.drawString(50, 50, f"page {page + 1}")
+        c.showPage()
+    c.save()
+
+    with pikepdf.open(filename) as pdf:
+        assert len(pdf.pages) == expected_pages
+        forms = {
+            name
+            for page in pdf.pages
+            for name in page.Resources.get("/XObject", {}).keys()
+        }
+    assert len(forms) == page_count
+
+
+def placements(pdf):
+    """(form, x, y) of every page form placed on each sheet page."""
+    import pikepdf
+
+    sheets = []
+    for page in pdf.pages:
+        placed = []
+        for operands, operator in pikepdf.parse_content_stream(page):
+            if str(operator) == "cm":
+                x, y = float(operands[4]), float(operands[5])
+            elif str(operator) == "Do":
+                placed.append((str(operands[0]), round(x, 3), round(y, 3)))
+        sheets.append(placed)
+    return sheets
+
+
+def test_creep_shifts_pages_towards_the_spine(tmp_path):
+    pikepdf = pytest.importorskip("pikepdf")
+    filename = str(tmp_path / "booklet.pdf")
+    c = make_canvas(filename, sheet="A4", creep=2)
+    for page in range(8):
+        c.drawString(50, 50, f"page {page + 1}")
+        c.showPage()
+    c.save()
+
+    # One A5 spread centred on landscape A4, the spine in the middle
+    page_width = A5[0]
+    x = (landscape(A4)[0] - 2 * page_width) / 2
+    spine = x + page_width
+
+    def placed(left, right, shift):
+        return [
+            (f"/FormXob.page{left}", round(x + shift, 3), 0),
+            (f"/FormXob.page{right}", round(spine - shift, 3), 0),
+        ]
+
+    with pikepdf.open(filename) as pdf:
+        assert placements(pdf) == [
+            placed(7, 0, 0),  # outer sheet, front and back
+            placed(1, 6, 0),
+            placed(5, 2, 2),  # inner sheet, 2 pt towards the spine
+            placed(3, 4, 2),
+        ]
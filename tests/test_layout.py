@@ -0,0 +1,78 @@
+import pytest
+from reportlab.lib.pagesizes import A5
+from reportlab.lib.units import mm
+
+from geometry import PAPER_SIZES, get_layout
+from month_spread import spread_table
+from year_spread import year_grid_table
+
+
+def test_reference_layout():
+    layout = get_layout("A5", 5)
+    assert layout.pagesize == A5
+    assert layout.dot_spacing == pytest.approx(5 * mm)
+    assert len(layout.dot_columns) == 26
+    assert layout.dot_columns[0] == pytest.approx(13 * mm)
+    assert layout.dot_columns[-1] == pytest.approx(138 * mm)
+    assert get_layout() == layout
+
+
+@pytest.mark.parametrize("paper, pitch_mm", [("A7", 5), ("A5", 3)])
+def test_unknown_layout(paper, pitch_mm):
+    with pytest.raises(ValueError):
+        get_layout(paper, pitch_mm)
+
+
+def test_spread_table_matches_reference_offsets():
+    # Offsets of the spread as drawn before the layout became configurable
+    table = spread_table(get_layout("A5", 5))
+    page_height = A5[1]
+    assert table["line_x_start"] == pytest.approx(13 * mm)
+    assert table["line_x_split"] == pytest.approx(98 * mm)
+    assert table["line_x_resume"] == pytest.approx(103 * mm)
+    assert table["line_x_end"] == pytest.approx(138 * mm)
+    assert table["right_block_width"] == pytest.approx(35 * mm)
+    assert table["line_y"] == pytest.approx(page_height - 10 * mm)
+    assert table["vertical_line_y_end"] == pytest.approx(page_height - 165 * mm)
+    assert table["next_month_y"] == pytest.approx(page_height - 175 * mm)
+
+
+@pytest.mark.parametrize("paper", list(PAPER_SIZES))
+@pytest.mark.parametrize("pitch_mm", [5, 4])
+def test_spread_ends_on_last_dot_column(paper, pitch_mm):
+    layout = get_layout(paper, pitch_mm)
+    try:
+        table = spread_table(layout)
+    except ValueError:
+        pytest.skip(f"{paper} with {pitch_mm} mm pitch has no monthly spread")
+    assert table["line_x_end"] == pytest.approx(layout.dot_columns[-1])
+
+
+def test_too_small_for_spread():
+    with pytest.raises(ValueError, match="too small"):
+        spread_table(get_layout("A6", 5))
+
+
+def test_year_grid_table():
+    table = year_grid_table(get_layout("A5", 5))
+    assert (table["cols"], table["rows"]) == (4, 3)
+    assert table["col_step"] == pytest.approx(11 * 5 * mm)
+    assert table["row_step"] == pytest.approx(9 * 5 * mm)
+
+
+def test_year_grid_falls_back_to_more_pages():
+    # Twelve months do not fit on A6 with a 5 mm pitch, six per page do
+    table = year_grid_table(get_layout("A6", 5))
+    assert (table["cols"], table["rows"]) == (3, 2)
+    assert table["months_per_page"] == 6
+
+    tiny = get_layout("A6", 5)._replace(page_width=50 * mm, page_height=70 * mm)
+    with pytest.raises(ValueError, match="too small"):
+        year_grid_table(tiny)
+
+
+def test_year_book_on_a6(tmp_path):
+    import year_spread
+
+    year_spread.create_pdf(str(tmp_path / "year.pdf"), paper="A6", pitch_mm=5)
+    assert (tmp_path / "year.pdf").stat().st_size > 0
@@ -0,0 +1,121 @@
+import pytest
+
+from book_movie_spread import fit_text, grid_page_table, section_pages
+from geometry import get_layout
+from media_log import (
+    RATING_MARKS,
+    STATUS_MARKS,
+    LogEntry,
+    iter_log,
+    log_sections,
+    normalize_mark,
+)
+
+
+def write_log(tmp_path, rows):
+    path = tmp_path / "log.csv"
+    path.write_text(
+        "section,title,status,rating\n" + "".join(f"{row}\n" for row in rows),
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+@pytest.mark.parametrize(
+    "value, marks, expected",
+    [
+        ("", STATUS_MARKS, ""),
+        (None, RATING_MARKS, ""),
+        ("Repeat", STATUS_MARKS, "R"),
+        (" n ", STATUS_MARKS, "N"),
+        ("Didn't finish", RATING_MARKS, "1"),
+        ("4", RATING_MARKS, "4"),
+    ],
+)
+def test_normalize_mark(value, marks, expected):
+    assert normalize_mark(value, marks) == expected
+
+
+def test_normalize_mark_rejects_unknown_values():
+    with pytest.raises(ValueError, match="Unknown log value"):
+        normalize_mark("6", RATING_MARKS)
+
+
+def test_iter_log(tmp_path):
+    path = write_log(
+        tmp_path,
+        [
+            "Light films, Paddington ,new,great",
+            "GAMES,Celeste,R,5",
+            "light films,Amélie,,ok",
+        ],
+    )
+    assert list(iter_log(path, section="Light Films")) == [
+        LogEntry("LIGHT FILMS", "Paddington", "N", "5"),
+        LogEntry("LIGHT FILMS", "Amélie", "", "3"),
+    ]
+    assert log_sections(path) == {"LIGHT FILMS", "GAMES"}
+
+
+def test_iter_log_reports_line_of_bad_value(tmp_path):
+    path = write_log(tmp_path, ["GAMES,Celeste,new,good", "GAMES,Tetris,soon,"])
+    with pytest.raises(ValueError, match=r"log\.csv:3: Unknown log value 'soon'"):
+        list(iter_log(path))
+
+
+def capacity(layout, mirror, text=""):
+    return len(grid_page_table(layout, mirror, bool(text))["rows"])
+
+
+@pytest.mark.parametrize("paper, pitch_mm", [("A5", 5), ("A5", 4), ("A6", 5)])
+def test_section_pages_fill_own_pages(paper, pitch_mm):
+    layout = get_layout(paper, pitch_mm)
+    size = capacity(layout, False, "GAMES") + capacity(layout, True)
+    entries = list(range(size))
+    pages = list(section_pages("GAMES", [False, True], entries, layout))
+    assert [(mirror, text) for mirror, text, _ in pages] == [
+        (False, "GAMES"),
+        (True, ""),
+    ]
+    assert [entry for _, _, chunk in pages for entry in chunk] == entries
+
+
+def test_section_pages_add_whole_spreads():
+    layout = get_layout()
+    own = capacity(layout, False, "GAMES") + capacity(layout, True)
+    pages = list(section_pages("GAMES", [False, True], range(own + 1), layout))
+    assert [(mirror, len(chunk)) for mirror, _, chunk in pages[2:]] == [
+        (False, 1),
+        (True, 0),
+    ]
+
+    # Two extra pages already make a whole spread
+    extra = own + capacity(layout, False) + 1
+    pages = list(section_pages("GAMES", [False, True], range(extra), layout))
+    assert [(mirror, len(chunk)) for mirror, _, chunk in pages[2:]] == [
+        (False, capacity(layout, False)),
+        (True, 1),
+    ]
+
+
+def test_section_pages_single_page_section():
+    layout = get_layout()
+    pages = list(section_pages("FOREIGN LANGUAGES", [True], [], layout))
+    assert pages == [(True, "FOREIGN LANGUAGES", [])]
+
+
+def test_fit_text():
+    from drawing import LIGHT_FONT, register_fonts
+    from svg_canvas import SVGCanvas
+
+    register_fonts()
+    c = SVGCanvas()
+    assert fit_text(c, "Dune", LIGHT_FONT, 10, 100) == "Dune"
+    title = "The Hitchhiker's Guide to the Galaxy " * 5
+    fitted = fit_text(c, title, LIGHT_FONT, 10, 100)
+    assert fitted.endswith("…")
+    assert c.stringWidth(fitted, LIGHT_FONT, 10) <= 100
+    # One more character would not have fitted
+    longer = title[: len(fitted)] + "…"
+    assert c.stringWidth(longer, LIGHT_FONT, 10) > 100
+    assert fit_text(c, title, LIGHT_FONT, 10, 1) == "…"
@@ -0,0 +1,106 @@
+from datetime import date
+
+import pytest
+
+import overlay
+from overlay import build_index
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(overlay, "OVERLAY_CACHE_DIR", str(tmp_path / "cache"))
+
+
+def write_csv(tmp_path, rows):
+    path = tmp_path / "events.csv"
+    path.write_text("start,end,yearly\n" + "".join(f"{row}\n" for row in rows))
+    return str(path)
+
+
+def days(index, category):
+    return sorted(day for day, categories in index.items() if category in categories)
+
+
+def test_single_event_clipped_to_years(tmp_path):
+    path = write_csv(tmp_path, ["2025-12-30,2026-01-02,"])
+    index = build_index({"trips": path}, [2026])
+    assert days(index, "trips") == [date(2026, 1, 1), date(2026, 1, 2)]
+
+
+def test_yearly_event_repeats(tmp_path):
+    path = write_csv(tmp_path, ["2000-05-17,,yes"])
+    index = build_index({"birthdays": [path]}, [2026, 2027])
+    assert days(index, "birthdays") == [date(2026, 5, 17), date(2027, 5, 17)]
+
+
+def test_yearly_event_across_new_year(tmp_path):
+    path = write_csv(tmp_path, ["2025-12-30,2026-01-02,1"])
+    index = build_index({"other": path}, [2026])
+    assert days(index, "other") == [
+        date(2026, 1, 1),
+        date(2026, 1, 2),
+        date(2026, 12, 30),
+        date(2026, 12, 31),
+    ]
+
+
+def test_yearly_event_not_before_its_start(tmp_path):
+    path = write_csv(tmp_path, ["2026-12-30,2027-01-02,1"])
+    index = build_index({"other": path}, [2026])
+    assert days(index, "other") == [date(2026, 12, 30), date(2026, 12, 31)]
+
+
+def test_yearly_event_on_29_february(tmp_path):
+    path = write_csv(tmp_path, ["2024-02-29,,true"])
+    index = build_index({"birthdays": path}, [2026])
+    assert days(index, "birthdays") == [date(2026, 3, 1)]
+
+
+def test_ics_all_day_end_is_exclusive(tmp_path):
+    path = tmp_path / "holidays.ics"
+    path.write_text(
+        "BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\n"
+        "DTSTART;VALUE=DATE:20260406\r\nDTEND;VALUE=DATE:20260408\r\n"
+        "END:VEVENT\r\nEND:VCALENDAR\r\n"
+    )
+    index = build_index({"schulferien": str(path)}, [2026])
+    assert days(index, "schulferien") == [date(2026, 4, 6), date(2026, 4, 7)]
+
+
+def write_ics(tmp_path, start, rrule):
+    path = tmp_path / "events.ics"
+    path.write_text(
+        "BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\n"
+        f"DTSTART;VALUE=DATE:{start}\r\nRRULE:{rrule}\r\n"
+        "END:VEVENT\r\nEND:VCALENDAR\r\n"
+    )
+    return str(path)
+
+
+def test_ics_yearly_rule_repeats(tmp_path):
+    path = write_ics(tmp_path, "20200517", "FREQ=YEARLY;BYMONTH=5;BYMONTHDAY=17")
+    index = build_index({"birthdays": path}, [2026, 2027])
+    assert days(index, "birthdays") == [date(2026, 5, 17), date(2027, 5, 17)]
+
+
+def test_ics_yearly_rule_until(tmp_path):
+    path = write_ics(tmp_path, "20200517", "FREQ=YEARLY;UNTIL=20260601T000000Z")
+    index = build_index({"birthdays": path}, [2026, 2027])
+    assert days(index, "birthdays") == [date(2026, 5, 17)]
+
+
+def test_ics_yearly_rule_count(tmp_path):
+    path = write_ics(tmp_path, "20250517", "FREQ=YEARLY;COUNT=2")
+    index = build_index({"birthdays": path}, [2026, 2027])
+    assert days(index, "birthdays") == [date(2026, 5, 17)]
+
+
+@pytest.mark.parametrize(
+    "rrule",
+    ["FREQ=WEEKLY;BYDAY=MO", "FREQ=YEARLY;INTERVAL=2", "FREQ=YEARLY;BYMONTH=6"],
+)
+def test_ics_unsupported_rule_marks_first_occurrence(tmp_path, rrule):
+    path = write_ics(tmp_path, "20260105", rrule)
+    with pytest.warns(UserWarning, match="unsupported RRULE"):
+        index = build_index({"other": path}, [2026, 2027])
+    assert days(index, "other") == [date(2026, 1, 5)]
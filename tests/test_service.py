@@ -0,0 +1,198 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+import service
+from service import GenerationService, job_kwargs, percentile
+
+
+def test_job_kwargs(tmp_path):
+    job = {
+        "type": "month",
+        "year": 2026,
+        "month": 3,
+        "overrides": {"paper": "B6", "deterministic": True},
+    }
+    job_type, kwargs = job_kwargs(7, job, str(tmp_path))
+    assert job_type == "month"
+    assert kwargs == {
+        "paper": "B6",
+        "deterministic": True,
+        "year": 2026,
+        "month": 3,
+        "filename": os.path.join(str(tmp_path), "month_2026_3_7.pdf"),
+    }
+
+
+@pytest.mark.parametrize(
+    "job, message",
+    [
+        ({"type": "poster"}, "Unknown job type"),
+        ({"type": "year", "overrides": ["paper"]}, "must be an object"),
+        ({"type": "year", "overrides": {"filename": "/tmp/x.pdf"}}, "filename"),
+        ({"type": "books", "overrides": {"log_csv": "/etc/passwd"}}, "log_csv"),
+        ({"type": "year", "overrides": {"overlay_sources": {}}}, "overlay_sources"),
+    ],
+)
+def test_job_kwargs_rejects_jobs(tmp_path, job, message):
+    with pytest.raises(ValueError, match=message):
+        job_kwargs(1, job, str(tmp_path))
+
+
+@pytest.mark.parametrize("year", [1e400, 2026.0, "2026", True, None, 1899, 2201])
+def test_job_kwargs_rejects_years(tmp_path, year):
+    with pytest.raises(ValueError, match="year must be an integer"):
+        job_kwargs(1, {"type": "year", "year": year}, str(tmp_path))
+
+
+@pytest.mark.parametrize("month", [0, 13, -1, 3.5, "3"])
+def test_job_kwargs_rejects_months(tmp_path, month):
+    with pytest.raises(ValueError, match="month must be an integer"):
+        job_kwargs(1, {"type": "month", "month": month}, str(tmp_path))
+
+
+def test_job_kwargs_keeps_output_inside_output_dir(tmp_path):
+    output_dir = str(tmp_path)
+    for job_type in service.JOB_MODULES:
+        _, kwargs = job_kwargs(3, {"type": job_type}, output_dir)
+        assert os.path.dirname(kwargs["filename"]) == output_dir
+
+
+def test_percentile():
+    assert percentile([], 50) is None
+    assert percentile([4.0], 99) == 4.0
+    values = list(range(1, 101))
+    assert percentile(values, 0) == 1
+    assert percentile(values, 50) == 51
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+
+
+class InlineWorker:
+    """Runs jobs in the test process instead of a worker process."""
+
+    def __init__(self, context, waiter):
+        pass
+
+    async def start(self):
+        pass
+
+    async def run(self, job_type, kwargs, timeout):
+        return service.run_job(job_type, kwargs)
+
+    def close(self):
+        pass
+
+
+async def exchange(service_instance, lines):
+    server = await asyncio.start_server(
+        service_instance.handle_client, "127.0.0.1", 0
+    )
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    responses = []
+    try:
+        for line in lines:
+            writer.write(line + b"\n")
+            await writer.drain()
+            responses.append(json.loads(await reader.readline()))
+    finally:
+        writer.close()
+        server.close()
+        await server.wait_closed()
+    return responses
+
+
+def test_handle_client_survives_malformed_lines(tmp_path, monkeypatch):
+    monkeypatch.setattr(service, "Worker", InlineWorker)
+    monkeypatch.setattr(service, "run_job", lambda job_type, kwargs: 0.25)
+
+    async def main():
+        generation = GenerationService(workers=1, output_dir=str(tmp_path))
+        await generation.start()
+        try:
+            return await exchange(
+                generation,
+                [
+                    b"not json",
+                    b"[1, 2]",
+                    b'"year"',
+                    b'{"type": "year", "year": 1e400}',
+                    b'{"type": "month", "month": 13}',
+                    b'{"type": "year", "overrides": {"filename": "/tmp/x.pdf"}}',
+                    b'{"type": "year", "year": 2027}',
+                    b'{"cmd": "metrics"}',
+                ],
+            )
+        finally:
+            await generation.stop()
+
+    *errors, job, metrics = asyncio.run(main())
+    assert [response["status"] for response in errors] == ["error"] * 6
+    assert job["status"] == "ok"
+    assert job["run_ms"] == 250.0
+    assert os.path.dirname(job["filename"]) == str(tmp_path)
+    assert metrics["completed"] == 1
+    assert metrics["failed"] == 0
+
+
+def test_handle_client_answers_unexpected_errors(tmp_path, monkeypatch):
+    def submit(job):
+        raise RuntimeError("boom")
+
+    async def main():
+        generation = GenerationService(workers=1, output_dir=str(tmp_path))
+        monkeypatch.setattr(generation, "submit", submit)
+        return await exchange(generation, [b'{"type": "year"}', b'{"cmd": "metrics"}'])
+
+    error, metrics = asyncio.run(main())
+    assert error == {"status": "error", "error": "RuntimeError: boom"}
+    assert metrics["queue_depth"] == 0
+
+
+def test_failed_job_is_reported(tmp_path, monkeypatch):
+    def run_job(job_type, kwargs):
+        raise service.JobError("ValueError: Unknown paper size 'Z9'")
+
+    monkeypatch.setattr(service, "Worker", InlineWorker)
+    monkeypatch.setattr(service, "run_job", run_job)
+
+    async def main():
+        generation = GenerationService(workers=1, output_dir=str(tmp_path))
+        await generation.start()
+        try:
+            return await generation.submit({"type": "year"}), generation.metrics()
+        finally:
+            await generation.stop()
+
+    response, metrics = asyncio.run(main())
+    assert response["status"] == "error"
+    assert response["error"] == "ValueError: Unknown paper size 'Z9'"
+    assert metrics["failed"] == 1
+
+
+def test_timed_out_worker_is_replaced(tmp_path):
+    # Real worker processes: the timed out one must be killed, not waited for
+    async def main():
+        generation = GenerationService(
+            workers=1, job_timeout=0.01, output_dir=str(tmp_path)
+        )
+        await generation.start()
+        try:
+            worker = generation.pool[0]
+            pid = worker.process.pid
+            timed_out = await generation.submit({"type": "books"})
+            replaced = worker.process.pid != pid
+            generation.job_timeout = 60
+            finished = await generation.submit({"type": "month", "month": 2})
+            return timed_out, replaced, finished
+        finally:
+            await generation.stop()
+
+    timed_out, replaced, finished = asyncio.run(main())
+    assert timed_out["status"] == "timeout"
+    assert replaced
+    assert finished["status"] == "ok"
+    assert os.path.exists(finished["filename"])
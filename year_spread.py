@@ -1,97 +1,105 @@
 import calendar
-
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A5
-from reportlab.lib.units import mm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.pdfgen import canvas
+from functools import lru_cache
+
+from drawing import (
+    BOLD_FONT,
+    TEXT_FONT,
+    draw_dot_grid,
+    draw_mini_calendar,
+    draw_text_across_grid,
+    draw_text_vertically_centered,
+    draw_title_page,
+    render_pdf,
+    render_svg,
+)
+from geometry import get_layout
+from overlay import build_index, draw_legend_swatch
 
 # --- SETTINGS ---
-PAGE_WIDTH, PAGE_HEIGHT = A5
-DOT_SPACING = 5 * mm
-MARGIN_LEFT = 13 * mm
-MARGIN_RIGHT = 5 * mm
-TEXT_VERTICAL_ADJUST = 0.5 * mm
-DOT_RADIUS = 0.25 * mm
-LINE_WIDTH = DOT_RADIUS * 2
-
-# Fonts
-TEXT_FONT_FILE = "Merienda/static/Merienda-Medium.ttf"
-BOLD_FONT_FILE = "Merienda/static/Merienda-Black.ttf"
-TEXT_FONT = "Merienda_medium"
-BOLD_FONT = "Merienda_black"
-pdfmetrics.registerFont(TTFont(TEXT_FONT, TEXT_FONT_FILE))
-pdfmetrics.registerFont(TTFont(BOLD_FONT, BOLD_FONT_FILE))
-
 year = 2026
-cal = calendar.Calendar(firstweekday=0)
-
-
-def draw_dot_grid(c, mirror_margins=False):
-    c.setFillGray(0.7)
-    left_margin = MARGIN_LEFT
-    right_margin = MARGIN_RIGHT
-    if mirror_margins:
-        left_margin, right_margin = MARGIN_RIGHT, MARGIN_LEFT
-    x = left_margin
-    while x <= PAGE_WIDTH - right_margin:
-        y = DOT_SPACING
-        while y <= PAGE_HEIGHT - DOT_SPACING:
-            c.circle(x, y, DOT_RADIUS, fill=1, stroke=0)
-            y += DOT_SPACING
-        x += DOT_SPACING
-    c.setFillGray(0)
-
-
-def draw_text_in_cell(
-    c, text, x, y, font_name=TEXT_FONT, font_size=9, color=colors.black
-):
-    c.setFont(font_name, font_size)
-    c.setFillColor(color)
-    text_width = c.stringWidth(text, font_name, font_size)
-    ascent = c._fontsize * 0.8
-    descent = c._fontsize * 0.2
-    text_height = ascent + descent
-    cx = x + (DOT_SPACING - text_width) / 2
-    cy = y + (DOT_SPACING - text_height) / 2 + descent - TEXT_VERTICAL_ADJUST
-    c.drawString(cx, cy, text)
-    c.setFillColor(colors.black)
-
-
-def draw_text_vertically_centered(c, text, x, y, font_name=TEXT_FONT, font_size=11):
-    c.setFont(font_name, font_size)
-    cy = y + (DOT_SPACING - font_size * 0.8) / 2
-    c.drawString(x, cy, text)
-
-
-def draw_text_across_grid(c, text, start_x, base_y, font_name=BOLD_FONT, font_size=11):
-    c.setFont(font_name, font_size)
-    x = start_x
-    for letter in text:
-        draw_text_in_cell(c, letter, x, base_y, font_name, font_size)
-        x += DOT_SPACING
-
-
-def draw_title_page(c, title):
-    draw_dot_grid(c)
-    c.saveState()
-    c.translate(PAGE_WIDTH / 2, PAGE_HEIGHT / 2)
-    c.rotate(90)  # 90 degrees counterclockwise
-    font_size = 80
-    c.setFont(TEXT_FONT, font_size)
-    text_width = c.stringWidth(title, TEXT_FONT, font_size)
-    c.drawString(-text_width / 2, -font_size / 2, title)
-    c.restoreState()
+FIRST_WEEKDAY = calendar.MONDAY
+
+# Columns x rows of the rotated year page, in order of preference. Pages
+# too small for all twelve months spread the year over two or three pages.
+YEAR_GRIDS = ((4, 3), (3, 2), (2, 2))
+MONTH_DOTS = 7  # width of a month, one dot per weekday
+MONTH_BLOCK_DOTS = 7  # header and up to six weeks
+
+LEGEND_TEXTS = [
+    "Important",
+    "Birthdays",
+    "Other",
+    "Trips",
+    "Schulferien",
+    "NRW Feiertage",
+]
+
+
+@lru_cache(maxsize=None)
+def calendar_page_table(layout):
+    """
+    Month blocks of the calendar pages for a layout, in dot pitches.
+
+    Every block holds a header line and up to six weeks; below the last
+    block there is room for the legend. Small pages get fewer months per
+    page instead of overlapping blocks.
+    """
+    page_dots = int(layout.page_height / layout.dot_spacing + 1e-6)
+    top_dots = page_dots - 2  # header line of the first month
+    legend_dots = len(LEGEND_TEXTS) + 1
+    for months_per_page in (3, 2, 1):
+        block_dots = (top_dots - legend_dots) // months_per_page
+        if block_dots >= 8:
+            break
+    else:
+        raise ValueError(f"{layout.paper} is too small for the calendar pages")
+    return {
+        "months_per_page": months_per_page,
+        "block_step": block_dots * layout.dot_spacing,
+        "line_length_left": 7 * layout.dot_spacing,
+        "line_gap": layout.dot_spacing,
+    }
+
 
+@lru_cache(maxsize=None)
+def year_grid_table(layout):
+    """
+    Grid and steps of the year page, which is drawn rotated so the page
+    height is its width. The first grid of YEAR_GRIDS that fits is used.
 
-def draw_year_page(c, year):
-    draw_dot_grid(c)
+    The grid starts one dot in from the left and with the first header two
+    dots below the top. The steps spread the months over the page, but no
+    further than lets the last column and row end inside it, with at least
+    a dot between neighbouring months.
+    """
+    dots_x = int(layout.page_height / layout.dot_spacing + 1e-6)
+    dots_y = int(layout.page_width / layout.dot_spacing + 1e-6)
+    for cols, rows in YEAR_GRIDS:
+        col_dots = min(dots_x // cols + 1, (dots_x - 1 - MONTH_DOTS) // (cols - 1))
+        row_dots = min(
+            dots_y // rows, (dots_y - 2 - (MONTH_BLOCK_DOTS - 1)) // (rows - 1)
+        )
+        if col_dots >= MONTH_DOTS + 1 and row_dots >= MONTH_BLOCK_DOTS:
+            break
+    else:
+        raise ValueError(f"{layout.paper} is too small for the year page")
+    return {
+        "cols": cols,
+        "rows": rows,
+        "months_per_page": cols * rows,
+        "col_step": col_dots * layout.dot_spacing,
+        "row_step": row_dots * layout.dot_spacing,
+    }
+
+
+def draw_year_page(c, year, layout=None):
+    layout = layout or get_layout()
+    draw_dot_grid(c, layout=layout)
     str_year = str(year)
     top_pair = str_year[:2]
     bottom_pair = str_year[2:]
-    font_size = 180
-    gap = 20  # gap between top and bottom pair
+    font_size = 180 * layout.page_scale
+    gap = 20 * layout.page_scale  # gap between top and bottom pair
 
     c.setFont(TEXT_FONT, font_size)
 
@@ -101,47 +109,52 @@ def draw_year_page(c, year):
     total_height = ascent + gap + ascent  # top + gap + bottom
 
     # Starting y so total block is vertically centered
-    y_start = (PAGE_HEIGHT - total_height) / 2 + gap
+    y_start = (layout.page_height - total_height) / 2 + gap
 
     # X positions to center horizontally
-    x_top = PAGE_WIDTH / 2 - c.stringWidth(top_pair, TEXT_FONT, font_size) / 2
-    x_bottom = PAGE_WIDTH / 2 - c.stringWidth(bottom_pair, TEXT_FONT, font_size) / 2
+    center_x = layout.page_width / 2
+    x_top = center_x - c.stringWidth(top_pair, TEXT_FONT, font_size) / 2
+    x_bottom = center_x - c.stringWidth(bottom_pair, TEXT_FONT, font_size) / 2
 
     # Draw top and bottom pairs
     c.drawString(x_top, y_start + ascent + gap, top_pair)
     c.drawString(x_bottom, y_start, bottom_pair)
 
 
-def draw_calendar(c, month, start_x, start_y):
-    y = start_y
-    for week in cal.monthdayscalendar(year, month):
-        x = start_x
-        for day in week:
-            if day != 0:
-                draw_text_in_cell(c, str(day), x, y)
-            x += DOT_SPACING
-        y -= DOT_SPACING
-    return y
+def draw_calendar(c, month, start_x, start_y, overlay=None, layout=None, year=year):
+    return draw_mini_calendar(
+        c,
+        year,
+        month,
+        start_x,
+        start_y,
+        overlay,
+        layout=layout,
+        first_weekday=FIRST_WEEKDAY,
+    )
 
 
-def draw_calendar_page(c, months, mirror=False):
-    draw_dot_grid(c, mirror_margins=not mirror)
+def draw_calendar_page(c, months, mirror=False, overlay=None, layout=None, year=year):
+    layout = layout or get_layout()
+    table = calendar_page_table(layout)
+    dot_spacing = layout.dot_spacing
+    draw_dot_grid(c, mirror_margins=not mirror, layout=layout)
 
-    left_margin = MARGIN_RIGHT if not mirror else MARGIN_LEFT
-    right_margin = MARGIN_LEFT if not mirror else MARGIN_RIGHT
-    line_length_left = 35 * mm
-    line_gap = 5 * mm
-    current_y = PAGE_HEIGHT - 2 * DOT_SPACING
+    left_margin = layout.margin_right if not mirror else layout.margin_left
+    right_margin = layout.margin_left if not mirror else layout.margin_right
+    line_length_left = table["line_length_left"]
+    line_gap = table["line_gap"]
+    current_y = layout.page_height - 2 * dot_spacing
 
     # Compute last dot column based on the dot grid
     x_start = left_margin
-    x_end = PAGE_WIDTH - right_margin
-    num_dots = int((x_end - x_start) / DOT_SPACING)
-    last_dot_x = x_start + num_dots * DOT_SPACING
+    x_end = layout.page_width - right_margin
+    num_dots = int((x_end - x_start) / dot_spacing)
+    last_dot_x = x_start + num_dots * dot_spacing
 
     for month in months:
         # Draw horizontal line with gap
-        c.setLineWidth(LINE_WIDTH)
+        c.setLineWidth(layout.line_width)
         c.line(left_margin, current_y, left_margin + line_length_left, current_y)
         c.line(
             left_margin + line_length_left + line_gap, current_y, last_dot_x, current_y
@@ -149,93 +162,91 @@ def draw_calendar_page(c, months, mirror=False):
 
         # Draw month abbreviation above the left line
         abbrev = calendar.month_name[month][:3].upper() #type: ignore
-        total_width = len(abbrev) * DOT_SPACING
+        total_width = len(abbrev) * dot_spacing
         sep_start_x = left_margin + (line_length_left - total_width) / 2
-        draw_text_across_grid(c, abbrev, sep_start_x, current_y, font_name=TEXT_FONT)
+        draw_text_across_grid(
+            c, abbrev, sep_start_x, current_y, font_name=TEXT_FONT, layout=layout
+        )
 
         # Draw calendar directly below the line
-        draw_calendar(c, month, left_margin, current_y - DOT_SPACING)
+        draw_calendar(
+            c,
+            month,
+            left_margin,
+            current_y - dot_spacing,
+            overlay,
+            layout=layout,
+            year=year,
+        )
 
-        # Move to next line 55mm below current
-        current_y -= 55 * mm
+        # Move to next month block (55mm on A5)
+        current_y -= table["block_step"]
 
     # Draw "MISC" line below last month
     c.line(left_margin, current_y, last_dot_x, current_y)
     if mirror:
-        draw_text_vertically_centered(c, "LEGEND", left_margin, current_y)
-
-        additional_texts = [
-            "Important",
-            "Birthdays",
-            "Other",
-            "Trips",
-            "Schulferien",
-            "NRW Feiertage",
-        ]
+        draw_text_vertically_centered(
+            c, "LEGEND", left_margin, current_y, layout=layout
+        )
+
         smaller_font_size = 10  # 1 size smaller
-        for line in additional_texts:
-            current_y -= DOT_SPACING
+        for line in LEGEND_TEXTS:
+            current_y -= dot_spacing
+            if overlay is not None:
+                draw_legend_swatch(c, line, left_margin, current_y, dot_spacing)
             draw_text_vertically_centered(
-                c, line, left_margin + 5 * mm, current_y, TEXT_FONT, smaller_font_size
+                c,
+                line,
+                left_margin + dot_spacing,
+                current_y,
+                TEXT_FONT,
+                smaller_font_size,
+                layout=layout,
             )
     else:
-        draw_text_vertically_centered(c, "MISC", left_margin, current_y)
+        draw_text_vertically_centered(c, "MISC", left_margin, current_y, layout=layout)
 
 
-def draw_full_year_single_page(c, year):
+def draw_full_year_single_page(c, year, overlay=None, layout=None, first_month=1):
     """
-    Draw a full year calendar on one A5 page,
+    Draw a full year calendar on one page,
     rotated 90° counter-clockwise, months in a 4x3 grid.
     Dot grid remains unrotated.
+
+    Small pages use a smaller grid (see year_grid_table) and take the
+    months from first_month on, one call per page.
     """
+    layout = layout or get_layout()
+    dot_spacing = layout.dot_spacing
 
     # Draw dot grid in normal orientation
-    draw_dot_grid(c, True)
+    draw_dot_grid(c, True, layout=layout)
 
     c.saveState()
 
     # Rotate content 90° counter-clockwise
-    c.translate(PAGE_WIDTH, 0)
+    c.translate(layout.page_width, 0)
     c.rotate(90)
 
-    rotated_width = PAGE_HEIGHT
-    rotated_height = PAGE_WIDTH
-
-    cols = 4
-    rows = 3
+    table = year_grid_table(layout)
+    rotated_height = layout.page_width
+    cols, rows = table["cols"], table["rows"]
+    line_length = MONTH_DOTS * dot_spacing
 
-    # Snap usable area to dot grid
-    usable_width = rotated_width
-    usable_height = rotated_height
-
-    dots_x = int(usable_width / DOT_SPACING)
-    dots_y = int(usable_height / DOT_SPACING)
-
-    dots_per_col = dots_x // cols + 1
-    dots_per_row = dots_y // rows
-
-    line_dots = 7
-    line_length = line_dots * DOT_SPACING
-    line_gap = DOT_SPACING
-
-    month = 1
+    month = first_month
     for row in range(rows):
         for col in range(cols):
             if month > 12:
                 break
 
             # Cell origin aligned to dot grid
-            cell_x = col * dots_per_col * DOT_SPACING + DOT_SPACING
-            cell_top_y = (
-                +rotated_height - DOT_SPACING * 2 - row * dots_per_row * DOT_SPACING
-            )
+            cell_x = col * table["col_step"] + dot_spacing
+            cell_top_y = rotated_height - dot_spacing * 2 - row * table["row_step"]
 
-            # Center header line inside the cell
-            cell_width = dots_per_col * DOT_SPACING
             line_start_x = cell_x
             line_y = cell_top_y
 
-            c.setLineWidth(LINE_WIDTH)
+            c.setLineWidth(layout.line_width)
             c.line(
                 line_start_x,
                 line_y,
@@ -245,7 +256,7 @@ def draw_full_year_single_page(c, year):
 
             # Month title (bold, centered over 7-dot line)
             abbrev = calendar.month_name[month][:3].upper()
-            title_width = len(abbrev) * DOT_SPACING
+            title_width = len(abbrev) * dot_spacing
             title_x = line_start_x + (line_length - title_width) / 2
 
             draw_text_across_grid(
@@ -255,18 +266,21 @@ def draw_full_year_single_page(c, year):
                 line_y,
                 font_name=BOLD_FONT,
                 font_size=9,
+                layout=layout,
             )
 
             # Calendar starts exactly one dot below header
-            cal_start_y = line_y - DOT_SPACING
-            draw_calendar(c, month, line_start_x, cal_start_y)
+            cal_start_y = line_y - dot_spacing
+            draw_calendar(
+                c, month, line_start_x, cal_start_y, overlay, layout=layout, year=year
+            )
 
             month += 1
 
     c.restoreState()
 
 
-def draw_rectangles_page(c):
+def draw_rectangles_page(c, layout=None):
     """
     Draw dot grid (mirrored margins) and 8 rounded rectangles (2x4),
     aligned to the dot grid.
@@ -277,9 +291,11 @@ def draw_rectangles_page(c):
         - gap between row 2 and 3: 3 dot spacings
     - Corner radius: 1 dot spacing
     """
+    layout = layout or get_layout()
+    dot_spacing = layout.dot_spacing
 
     # Draw mirrored dot grid
-    draw_dot_grid(c, mirror_margins=True)
+    draw_dot_grid(c, mirror_margins=True, layout=layout)
 
     cols = 2
     rows = 4
@@ -287,7 +303,7 @@ def draw_rectangles_page(c):
     gap_dots = 1
     middle_gap_dots = 2
 
-    radius = DOT_SPACING
+    radius = dot_spacing
 
     labels = [
         "PHD",
@@ -300,12 +316,12 @@ def draw_rectangles_page(c):
         "OTHER",
     ]
 
-    usable_width = PAGE_WIDTH - MARGIN_LEFT - MARGIN_RIGHT
-    usable_height = PAGE_HEIGHT - 2 * DOT_SPACING
+    usable_width = layout.page_width - layout.margin_left - layout.margin_right
+    usable_height = layout.page_height - 2 * dot_spacing
 
     # Snap usable area to grid
-    dots_x = int(usable_width / DOT_SPACING)
-    dots_y = int(usable_height / DOT_SPACING)
+    dots_x = int(usable_width / dot_spacing)
+    dots_y = int(usable_height / dot_spacing)
 
     # Total vertical gaps in dots
     total_row_gaps = gap_dots * (rows - 1)
@@ -315,17 +331,17 @@ def draw_rectangles_page(c):
     rect_dots_x = (dots_x - gap_dots) // cols
     rect_dots_y = (dots_y - total_row_gaps) // rows
 
-    rect_width = rect_dots_x * DOT_SPACING
-    rect_height = rect_dots_y * DOT_SPACING
+    rect_width = rect_dots_x * dot_spacing
+    rect_height = rect_dots_y * dot_spacing
 
-    c.setLineWidth(LINE_WIDTH)
+    c.setLineWidth(layout.line_width)
 
     label_index = 0
 
     for row in range(rows):
         for col in range(cols):
             # Horizontal position
-            x = MARGIN_RIGHT + col * (rect_width + gap_dots * DOT_SPACING)
+            x = layout.margin_right + col * (rect_width + gap_dots * dot_spacing)
 
             # Vertical position (top to bottom)
             y_offset_dots = row * (rect_dots_y + gap_dots)
@@ -334,7 +350,7 @@ def draw_rectangles_page(c):
             if row >= 2:
                 y_offset_dots += middle_gap_dots - gap_dots
 
-            y = DOT_SPACING + (dots_y - rect_dots_y - y_offset_dots) * DOT_SPACING
+            y = dot_spacing + (dots_y - rect_dots_y - y_offset_dots) * dot_spacing
 
             c.roundRect(
                 x,
@@ -349,61 +365,95 @@ def draw_rectangles_page(c):
             text = labels[label_index]
             label_index += 1
 
-            text_width = c.stringWidth(text, TEXT_FONT, 11)
+            text_width = c.stringWidth(text, TEXT_FONT, 11 * layout.font_scale)
             text_x = x + (rect_width - text_width) / 2
 
             # First cell below the top edge
-            text_y = y + rect_height - DOT_SPACING
+            text_y = y + rect_height - dot_spacing
 
             draw_text_vertically_centered(
                 c,
                 text,
                 text_x,
                 text_y,
+                layout=layout,
             )
 
 
-def create_pdf(filename=None):
-    if filename is None:
-        filename = f"bullet_journal_{year}_full.pdf"
-    c = canvas.Canvas(filename, pagesize=A5)
+def draw_pages(c, overlay=None, layout=None, year=year):
+    """Draw all pages of the year book, shared by the PDF and SVG output."""
+    layout = layout or get_layout()
 
     # Page 1: Year
-    draw_year_page(c, year)
-    c.showPage()
-
-    # Page 2: Jan–Mar, mirrored margins as before
-    draw_calendar_page(c, [1, 2, 3], mirror=False)
-    c.showPage()
-
-    # Page 3: Apr–Jun, mirrored
-    draw_calendar_page(c, [4, 5, 6], mirror=True)
+    draw_year_page(c, year, layout=layout)
     c.showPage()
 
-    # Page 4: Jul–Sep, mirrored margins like page 2
-    draw_calendar_page(c, [7, 8, 9], mirror=False)
-    c.showPage()
+    # Pages 2-5 on A5: three months per page (Jan–Mar, Apr–Jun, ...),
+    # alternating margins starting with the normal ones
+    per_page = calendar_page_table(layout)["months_per_page"]
+    for i, first in enumerate(range(1, 13, per_page)):
+        months = list(range(first, min(first + per_page, 13)))
+        draw_calendar_page(
+            c, months, mirror=i % 2 == 1, overlay=overlay, layout=layout, year=year
+        )
+        c.showPage()
 
-    # Page 5: Oct–Dec, mirrored like page 3
-    draw_calendar_page(c, [10, 11, 12], mirror=True)
+    draw_dot_grid(c, mirror_margins=True, layout=layout)
     c.showPage()
 
-    draw_dot_grid(c, mirror_margins=True)
+    draw_title_page(c, "VACATIONS", layout=layout)
     c.showPage()
 
-    draw_title_page(c, "VACATIONS")
-    c.showPage()
+    per_page = year_grid_table(layout)["months_per_page"]
+    for first in range(1, 13, per_page):
+        draw_full_year_single_page(c, year, overlay, layout=layout, first_month=first)
+        c.showPage()
 
-    draw_full_year_single_page(c, year)
+    draw_title_page(c, "GOALS", layout=layout)
     c.showPage()
 
-    draw_title_page(c, "GOALS")
+    draw_rectangles_page(c, layout=layout)
     c.showPage()
 
-    draw_rectangles_page(c)
-    c.showPage()
 
-    c.save()
+def create_pdf(
+    filename=None,
+    sheet=None,
+    creep=0,
+    profile="default",
+    overlay_sources=None,
+    paper="A5",
+    pitch_mm=5,
+    year=year,
+    deterministic=False,
+):
+    """
+    Build the year book. overlay_sources maps a legend category to ICS/CSV
+    files, see overlay.py; the other options are those of render_pdf.
+    """
+    layout = get_layout(paper, pitch_mm)
+    if filename is None:
+        filename = f"bullet_journal_{year}_full.pdf"
+    overlay = build_index(overlay_sources, [year]) if overlay_sources else None
+    render_pdf(
+        draw_pages,
+        filename,
+        layout,
+        sheet=sheet,
+        creep=creep,
+        profile=profile,
+        deterministic=deterministic,
+        overlay=overlay,
+        year=year,
+    )
+
+
+def create_svg(filename=None, overlay_sources=None, paper="A5", pitch_mm=5, year=year):
+    layout = get_layout(paper, pitch_mm)
+    if filename is None:
+        filename = f"bullet_journal_{year}_full.svg"
+    overlay = build_index(overlay_sources, [year]) if overlay_sources else None
+    return render_svg(draw_pages, filename, layout, overlay=overlay, year=year)
 
 
 if __name__ == "__main__":